@@ -2,6 +2,9 @@
 Carrier modules for manifest population.
 """
 
+import re
+from functools import lru_cache
+
 from .base import BaseCarrier, ShipmentRecord as ShipmentRecord, PlacementResult as PlacementResult
 from .asendia import AsendiaCarrier, Asendia2025Carrier
 from .postnord import PostNordCarrier
@@ -35,84 +38,136 @@ CARRIER_REGISTRY = {
 }
 
 
+# Distinguishing tokens found in carrier names (cell B3 of the carrier sheet).
+# Each token sets a bit, so a single scan of the name yields every token
+# present and dispatch becomes a check against the resulting bitmask.
+_JERSEY_POST = 1 << 0
+_PUBLICATIONS = 1 << 1
+_MMP_PARCEL = 1 << 2
+_LETTERSHOP = 1 << 3
+_ASENDIA = 1 << 4
+_YEAR_2025 = 1 << 5
+_POSTNORD = 1 << 6
+_SPRING = 1 << 7
+_AIR_BUSINESS = 1 << 8
+_MAIL_AMERICAS = 1 << 9
+_LANDMARK = 1 << 10
+_DEUTSCHE_POST = 1 << 11
+_UNITED_BUSINESS = 1 << 12
+_SPL = 1 << 13
+_NZP = 1 << 14
+_ETOE = 1 << 15
+_ROYAL_MAIL = 1 << 16
+_METAFORA = 1 << 17
+
+_CARRIER_TOKENS = {
+    'jersey post': _JERSEY_POST,
+    'publications': _PUBLICATIONS,
+    'mmp parcel': _MMP_PARCEL,
+    'lettershop': _LETTERSHOP,
+    'asendia': _ASENDIA,
+    '2025': _YEAR_2025,
+    'postnord': _POSTNORD,
+    'spring': _SPRING,
+    'air business': _AIR_BUSINESS,
+    'airbusiness': _AIR_BUSINESS,
+    'mail americas': _MAIL_AMERICAS,
+    'mail africa': _MAIL_AMERICAS,
+    'landmark': _LANDMARK,
+    'deutsche': _DEUTSCHE_POST,
+    'deutschepost': _DEUTSCHE_POST,
+    'dpi': _DEUTSCHE_POST,
+    'ukmail': _DEUTSCHE_POST,
+    'united business': _UNITED_BUSINESS,
+    'ubl': _UNITED_BUSINESS,
+    'spl': _SPL,
+    'nzp': _NZP,
+    'etoe': _ETOE,
+    't&d': _ETOE,
+    't d': _ETOE,
+    'royal mail': _ROYAL_MAIL,
+    'metafora': _METAFORA,
+}
+
+# Zero-width lookahead so overlapping tokens (e.g. 'ubl' inside 'publications')
+# are all reported; longest tokens first so shared prefixes resolve to the
+# more specific token.
+_TOKEN_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(token) for token in sorted(_CARRIER_TOKENS, key=len, reverse=True)) + '))'
+)
+
+# Explicitly excluded carriers - checked before any positive match
+_UNSUPPORTED_CARRIERS = (
+    (_JERSEY_POST, "Jersey Post is not a supported carrier: {}"),
+    (_PUBLICATIONS, "Asendia Publications is not a supported carrier: {}"),
+    (_MMP_PARCEL, "PostNord MMP Parcel is not a supported carrier (use standard PostNord): {}"),
+    (_LETTERSHOP, "Lettershop is not a supported carrier: {}"),
+)
+_UNSUPPORTED_MASK = _JERSEY_POST | _PUBLICATIONS | _MMP_PARCEL | _LETTERSHOP
+
+# Dispatch rules in priority order: (carrier bits, variants, missing-variant error).
+# Variants are (bits, registry key) tried in order; bits of 0 is the default.
+_DISPATCH_RULES = (
+    # Year-specific Asendia - default to 2026 for any other variant
+    (_ASENDIA, ((_YEAR_2025, 'Asendia 2025'), (0, 'Asendia 2026')), None),
+    # PostNord (ignore any year suffix)
+    (_POSTNORD, ((0, 'PostNord'),), None),
+    (_SPRING, ((0, 'Spring'),), None),
+    (_AIR_BUSINESS, ((0, 'Air Business'),), None),
+    # Matches "Mail Americas", "Mail Americas Non Ready", "Mail Africa", etc.
+    (_MAIL_AMERICAS, ((0, 'Mail Americas'),), None),
+    (_LANDMARK, ((0, 'Landmark Global'),), None),
+    (_DEUTSCHE_POST, ((0, 'Deutsche Post'),), None),
+    # United Business: SPL ETOE, then NZP ETOE (also "ETOE"/"T&D"), default ADS
+    (_UNITED_BUSINESS, (
+        (_SPL, 'United Business SPL ETOE'),
+        (_NZP | _ETOE, 'United Business NZP ETOE'),
+        (0, 'United Business ADS'),
+    ), None),
+    (_ROYAL_MAIL, ((0, 'Royal Mail International 2026'),), None),
+    (_METAFORA, (
+        (_SPL, 'Metafora 2026 - SPL'),
+        (_NZP, 'Metafora 2026 - NZP'),
+    ), "Metafora variant (NZP/SPL) not specified: {}"),
+)
+
+
+@lru_cache(maxsize=256)
+def _resolve_carrier_key(carrier_name: str) -> str:
+    """Resolve a carrier sheet name to its CARRIER_REGISTRY key."""
+    mask = 0
+    for match in _TOKEN_PATTERN.finditer(carrier_name.lower()):
+        mask |= _CARRIER_TOKENS[match.group(1)]
+
+    if mask & _UNSUPPORTED_MASK:
+        for bit, message in _UNSUPPORTED_CARRIERS:
+            if mask & bit:
+                raise ValueError(message.format(carrier_name))
+
+    for carrier_bits, variants, missing_variant in _DISPATCH_RULES:
+        if not mask & carrier_bits:
+            continue
+        for variant_bits, key in variants:
+            if not variant_bits or mask & variant_bits:
+                return key
+        raise ValueError(missing_variant.format(carrier_name))
+
+    raise ValueError(f"Unknown carrier: {carrier_name}. Available: {list(CARRIER_REGISTRY.keys())}")
+
+
 def get_carrier(carrier_name: str) -> BaseCarrier:
-    """Get carrier handler by name."""
+    """
+    Get carrier handler by name.
+
+    Name resolution is cached, but a new handler is returned on every call:
+    carriers accumulate per-run state (pending cell totals, aggregated rows,
+    order lines) and must not be shared between manifests.
+    """
     # Try exact match first
     if carrier_name in CARRIER_REGISTRY:
         return CARRIER_REGISTRY[carrier_name]()
 
-    # Normalise: lowercase, strip whitespace
-    carrier_lower = carrier_name.lower().strip()
-
-    # Explicitly exclude unsupported carriers
-    if 'jersey post' in carrier_lower:
-        raise ValueError(f"Jersey Post is not a supported carrier: {carrier_name}")
-
-    if 'publications' in carrier_lower:
-        raise ValueError(f"Asendia Publications is not a supported carrier: {carrier_name}")
-    
-    if 'mmp parcel' in carrier_lower:
-        raise ValueError(f"PostNord MMP Parcel is not a supported carrier (use standard PostNord): {carrier_name}")
-    
-    if 'lettershop' in carrier_lower:
-        raise ValueError(f"Lettershop is not a supported carrier: {carrier_name}")
-    
-    # Check for year-specific Asendia matches
-    if 'asendia' in carrier_lower:
-        if '2025' in carrier_name:
-            return CARRIER_REGISTRY['Asendia 2025']()
-        else:
-            # Default to 2026 for any other Asendia variant
-            return CARRIER_REGISTRY['Asendia 2026']()
-    
-    # Check for PostNord (ignore any year suffix)
-    if 'postnord' in carrier_lower:
-        return CARRIER_REGISTRY['PostNord']()
-    
-    # Check for Spring
-    if 'spring' in carrier_lower:
-        return CARRIER_REGISTRY['Spring']()
-    
-    # Check for Air Business
-    if 'air business' in carrier_lower or 'airbusiness' in carrier_lower:
-        return CARRIER_REGISTRY['Air Business']()
-    
-    # Check for Mail Americas (matches "Mail Americas", "Mail Americas Non Ready", etc.)
-    if 'mail americas' in carrier_lower or 'mail africa' in carrier_lower:
-        return CARRIER_REGISTRY['Mail Americas']()
-    
-    # Check for Landmark Global
-    if 'landmark' in carrier_lower:
-        return CARRIER_REGISTRY['Landmark Global']()
-    
-    # Check for Deutsche Post
-    if 'deutsche' in carrier_lower or 'deutschepost' in carrier_lower or 'dpi' in carrier_lower or 'ukmail' in carrier_lower:
-        return CARRIER_REGISTRY['Deutsche Post']()
-    
-    # Check for United Business variants
-    if 'united business' in carrier_lower or 'ubl' in carrier_lower:
-        # Check for SPL ETOE variant
-        if 'spl' in carrier_lower:
-            return CARRIER_REGISTRY['United Business SPL ETOE']()
-        # Check for NZP ETOE variant
-        if 'nzp' in carrier_lower or 'etoe' in carrier_lower or 't&d' in carrier_lower or 't d' in carrier_lower:
-            return CARRIER_REGISTRY['United Business NZP ETOE']()
-        # Default to ADS variant
-        return CARRIER_REGISTRY['United Business ADS']()
-    
-    # Check for Royal Mail International
-    if 'royal mail' in carrier_lower:
-        return CARRIER_REGISTRY['Royal Mail International 2026']()
-
-    # Check for Metafora
-    if 'metafora' in carrier_lower:
-        if 'spl' in carrier_lower:
-            return CARRIER_REGISTRY['Metafora 2026 - SPL']()
-        if 'nzp' in carrier_lower:
-            return CARRIER_REGISTRY['Metafora 2026 - NZP']()
-        raise ValueError(f"Metafora variant (NZP/SPL) not specified: {carrier_name}")
-
-    raise ValueError(f"Unknown carrier: {carrier_name}. Available: {list(CARRIER_REGISTRY.keys())}")
+    return CARRIER_REGISTRY[_resolve_carrier_key(carrier_name)]()
 
 
 def list_carriers() -> list:
@@ -16,10 +16,19 @@ Metadata:
   D6: Shipment date
 """
 
+from types import MappingProxyType
 from typing import Dict, Tuple
 from .base import BaseCarrier, ShipmentRecord, PlacementResult
 
 
+# Air Business only handles Ireland - include common variations
+_AIR_BUSINESS_COUNTRY_MAPPING = MappingProxyType({
+    'Republic of Ireland': 'Ireland',
+    'Eire': 'Ireland',
+    'IE': 'Ireland',
+})
+
+
 class AirBusinessCarrier(BaseCarrier):
     """Handler for Air Business Ireland manifests."""
     
@@ -39,11 +48,11 @@ class AirBusinessCarrier(BaseCarrier):
     
     def __init__(self):
         super().__init__()
-        # Air Business only handles Ireland - include common variations
-        self.country_mapping = {
-            'Republic of Ireland': 'Ireland',
-            'Eire': 'Ireland',
-            'IE': 'Ireland',
+        self.country_mapping = _AIR_BUSINESS_COUNTRY_MAPPING
+        # format -> (sheet, row, items_col, weight_col) for the fixed target cells
+        self._format_targets = {
+            format_type: ('Ireland Mail', row, self.ITEMS_COL, self.WEIGHT_COL)
+            for format_type, row in self.FORMAT_ROWS.items()
         }
     
     def build_country_index(self, workbook) -> Dict[str, dict]:
@@ -75,7 +84,8 @@ class AirBusinessCarrier(BaseCarrier):
         """
         Place a shipment record into the Air Business manifest.
         
-        Overrides base class to handle the fixed-row structure.
+        Overrides base class to handle the fixed-row structure. Totals are
+        written by flush_to_workbook().
         """
         # Validate country is Ireland
         manifest_country = self.map_country(record.country)
@@ -88,39 +98,21 @@ class AirBusinessCarrier(BaseCarrier):
         # Normalise format
         format_type = self.normalise_format(record.format)
         
-        if format_type not in self.FORMAT_ROWS:
+        # Get the fixed target cells for this format
+        target = self._format_targets.get(format_type)
+        if target is None:
             return PlacementResult(
                 success=False,
                 error_message=f"Unknown format: {record.format} (normalised: {format_type})"
             )
         
-        # Get the fixed row for this format
-        row = self.FORMAT_ROWS[format_type]
-        sheet = workbook['Ireland Mail']
-        
-        # Get current values
-        current_items_raw = sheet.cell(row=row, column=self.ITEMS_COL).value
-        current_weight_raw = sheet.cell(row=row, column=self.WEIGHT_COL).value
-        
-        # Convert to numeric
-        try:
-            current_items = int(current_items_raw) if current_items_raw not in (None, '', ' ') else 0
-        except (ValueError, TypeError):
-            current_items = 0
-        
-        try:
-            current_weight = float(current_weight_raw) if current_weight_raw not in (None, '', ' ') else 0.0
-        except (ValueError, TypeError):
-            current_weight = 0.0
-        
-        # Add values
-        sheet.cell(row=row, column=self.ITEMS_COL).value = current_items + record.items
-        sheet.cell(row=row, column=self.WEIGHT_COL).value = round(current_weight + record.weight, 3)
+        sheet_name, row, items_col, weight_col = target
+        self._accumulate(sheet_name, row, items_col, weight_col, record.items, record.weight)
         
         return PlacementResult(
             success=True,
-            sheet_name='Ireland Mail',
+            sheet_name=sheet_name,
             row=row,
-            items_col=self.ITEMS_COL,
-            weight_col=self.WEIGHT_COL
+            items_col=items_col,
+            weight_col=weight_col
         )
@@ -2,8 +2,80 @@
 Asendia UK Business Mail manifest handler.
 """
 
-from typing import Dict, Tuple
-from .base import BaseCarrier
+import os
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+from .base import BaseCarrier, fold_country
+
+
+# IST name -> Manifest name (shared read-only across instances)
+_ASENDIA_COUNTRY_MAPPING = MappingProxyType({
+    'United States of America': 'United States',
+    'Aland Islands': 'Åland Islands',
+    'South Korea': 'Korea, Republic of',
+    'Taiwan': 'Taiwan, Province of China',
+    'Bolivia': 'Bolivia, Plurinational State of',
+    'Reunion': 'Réunion',
+    'Saint Martin': 'Saint Martin (French part)',
+    'Sint Maarten': 'Sint Maarten (Dutch part)',
+    'Falkland Islands': 'Falkland Islands (Malvinas)',
+    'Saint Helena': 'Saint Helena, Ascension and Tristan da Cunha',
+    'Svalbard': 'Svalbard and Jan Mayen',
+    'Palestine': 'Palestine, State of',
+    'Democratic Republic of the Congo': 'Democratic Republic of Congo',
+    'Antigua and Barbuda': 'Antigua And Barbuda',
+    'Saint Kitts and Nevis': 'Saint Kitts And Nevis',
+    'Sao Tome and Principe': 'Sao Tome And Principe',
+    'Trinidad and Tobago': 'Trinidad And Tobago',
+    'Turks and Caicos Islands': 'Turks And Caicos Islands',
+    'Czechia': 'Czech Republic',
+    'Cote d\'Ivoire': 'Cote d\'Ivoire',
+    'Ivory Coast': 'Cote d\'Ivoire',
+    'Vietnam': 'Viet Nam',
+    'Laos': 'Lao People\'s Democratic Republic',
+    'Russia': 'Russian Federation',
+    'Venezuela': 'Venezuela, Bolivarian Republic of',
+    'Iran': 'Iran, Islamic Republic of',
+    'Syria': 'Syrian Arab Republic',
+    'Tanzania': 'Tanzania, United Republic of',
+    'Micronesia': 'Micronesia, Federated States of',
+    'Moldova': 'Moldova, Republic of',
+    'Brunei': 'Brunei Darussalam',
+    'North Korea': 'Korea, Democratic People\'s Republic of',
+    'Republic of the Congo': 'Congo',
+    'Virgin Islands (US)': 'Virgin Islands, U.S.',
+    'Virgin Islands (British)': 'Virgin Islands, British',
+    'Bonaire': 'Bonaire, Sint Eustatius and Saba',
+    'Eswatini': 'Swaziland',
+    'Myanmar (Burma)': 'Myanmar',
+    'East Timor': 'Timor-Leste',
+    'Macedonia': 'North Macedonia',
+    'Cape Verde': 'Cabo Verde',
+})
+
+
+# Folded IST name -> Manifest name, so accent/case variants share one entry
+_ASENDIA_FOLDED_MAPPING = MappingProxyType(
+    {fold_country(k): v for k, v in _ASENDIA_COUNTRY_MAPPING.items()}
+)
+
+
+# Header/label cells in the country columns that are not destinations
+_ASENDIA_SKIP = frozenset({
+    'Asendia UK Business Mail', 'Valid from', 'Work Required',
+    'Customer Name', 'Office Check', 'Subtotal', 'TOTAL',
+    'Shipment date', 'Customer Ref', 'PO', None
+})
+
+
+# Country indexes keyed by (template path, file mtime, file size), least
+# recently used first. The template is reloaded for every manifest but its
+# layout only changes when the template file itself is updated, so the scan
+# is shared. Cached indexes are shared between callers and must be treated
+# as read-only.
+_INDEX_CACHE: "OrderedDict[tuple, Dict[str, dict]]" = OrderedDict()
+_INDEX_CACHE_SIZE = 8
 
 
 class AsendiaCarrier(BaseCarrier):
@@ -30,103 +102,78 @@ class AsendiaCarrier(BaseCarrier):
     
     def __init__(self):
         super().__init__()
-        self.country_mapping = {
-            # IST name -> Manifest name
-            'United States of America': 'United States',
-            'Aland Islands': 'Åland Islands',
-            'South Korea': 'Korea, Republic of',
-            'Taiwan': 'Taiwan, Province of China',
-            'Bolivia': 'Bolivia, Plurinational State of',
-            'Reunion': 'Réunion',
-            'Saint Martin': 'Saint Martin (French part)',
-            'Sint Maarten': 'Sint Maarten (Dutch part)',
-            'Falkland Islands': 'Falkland Islands (Malvinas)',
-            'Saint Helena': 'Saint Helena, Ascension and Tristan da Cunha',
-            'Svalbard': 'Svalbard and Jan Mayen',
-            'Palestine': 'Palestine, State of',
-            'Democratic Republic of the Congo': 'Democratic Republic of Congo',
-            'Antigua and Barbuda': 'Antigua And Barbuda',
-            'Saint Kitts and Nevis': 'Saint Kitts And Nevis',
-            'Sao Tome and Principe': 'Sao Tome And Principe',
-            'Trinidad and Tobago': 'Trinidad And Tobago',
-            'Turks and Caicos Islands': 'Turks And Caicos Islands',
-            'Czechia': 'Czech Republic',
-            'Côte d\'Ivoire': 'Cote d\'Ivoire',
-            'Cote d\'Ivoire': 'Cote d\'Ivoire',
-            'Ivory Coast': 'Cote d\'Ivoire',
-            'Vietnam': 'Viet Nam',
-            'Laos': 'Lao People\'s Democratic Republic',
-            'Russia': 'Russian Federation',
-            'Venezuela': 'Venezuela, Bolivarian Republic of',
-            'Iran': 'Iran, Islamic Republic of',
-            'Syria': 'Syrian Arab Republic',
-            'Tanzania': 'Tanzania, United Republic of',
-            'Micronesia': 'Micronesia, Federated States of',
-            'Moldova': 'Moldova, Republic of',
-            'Brunei': 'Brunei Darussalam',
-            'North Korea': 'Korea, Democratic People\'s Republic of',
-            'Republic of the Congo': 'Congo',
-            'Virgin Islands (US)': 'Virgin Islands, U.S.',
-            'Virgin Islands (British)': 'Virgin Islands, British',
-            'Bonaire': 'Bonaire, Sint Eustatius and Saba',
-            'Eswatini': 'Swaziland',
-            'Myanmar (Burma)': 'Myanmar',
-            'East Timor': 'Timor-Leste',
-            'Macedonia': 'North Macedonia',
-            'Cape Verde': 'Cabo Verde',
-        }
+        self.country_mapping = _ASENDIA_COUNTRY_MAPPING
+    
+    def map_country(self, carrier_country: str) -> Optional[str]:
+        """Map IST country name to manifest name, ignoring accents and case."""
+        if type(carrier_country) is not str:
+            return carrier_country
+        return _ASENDIA_FOLDED_MAPPING.get(fold_country(carrier_country), carrier_country)
     
     def build_country_index(self, workbook) -> Dict[str, dict]:
         """Build index for both Priority and Non-Priority manifest sheets."""
+        try:
+            stat = os.stat(self.template_path)
+        except (TypeError, OSError):
+            # Template file unknown (workbook not loaded by the engine)
+            return self._scan_country_index(workbook)
+        
+        cache_key = (os.path.abspath(self.template_path), stat.st_mtime_ns, stat.st_size)
+        index = _INDEX_CACHE.get(cache_key)
+        if index is None:
+            index = _INDEX_CACHE[cache_key] = self._scan_country_index(workbook)
+            if len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+                _INDEX_CACHE.popitem(last=False)
+        else:
+            _INDEX_CACHE.move_to_end(cache_key)
+        return index
+    
+    def _scan_country_index(self, workbook) -> Dict[str, dict]:
+        """Scan both manifest sheets for country rows."""
         index = {}
+        index_setdefault = index.setdefault
+        skip_values = _ASENDIA_SKIP
+        row_section_start = self.ROW_SECTION_START
         
         for sheet_name in ['Priority Manifest', 'Non-Priority Manifest']:
             service = 'Priority' if 'Priority' == sheet_name.split()[0] else 'Economy'
             sheet = workbook[sheet_name]
             
-            skip_values = {
-                'Asendia UK Business Mail', 'Valid from', 'Work Required',
-                'Customer Name', 'Office Check', 'Subtotal', 'TOTAL',
-                'Shipment date', 'Customer Ref', 'PO', None
-            }
-            
             current_section = 'EU'
-            for row in range(13, sheet.max_row + 1):
-                country = sheet.cell(row=row, column=2).value
+            # Columns B (country) to K (right-hand ROW country) in one pass
+            for row, values in enumerate(
+                    sheet.iter_rows(min_row=13, min_col=2, max_col=11, values_only=True), start=13):
+                country = values[0]
                 
                 if country is None:
                     continue
                     
-                country_str = str(country).strip()
+                country_str = country.strip() if type(country) is str else str(country).strip()
                 
                 if country_str in skip_values or country_str.startswith('Valid from'):
                     continue
                 
-                if row >= self.ROW_SECTION_START:
+                if row >= row_section_start:
                     current_section = 'ROW'
                 
                 # Determine if this is left or right column in ROW section
                 section = 'left'
                 if current_section == 'ROW':
                     # Check if there's content in column K (right section country name)
-                    right_country = sheet.cell(row=row, column=11).value
-                    if right_country and str(right_country).strip():
+                    right_country = values[9]
+                    if right_country:
+                        right_name = (right_country.strip() if type(right_country) is str
+                                      else str(right_country).strip())
                         # Add right-side country too
-                        right_name = str(right_country).strip()
-                        if right_name not in skip_values:
-                            if right_name not in index:
-                                index[right_name] = {}
-                            index[right_name][service] = {
+                        if right_name and right_name not in skip_values:
+                            index_setdefault(right_name, {})[service] = {
                                 'sheet': sheet_name,
                                 'row': row,
                                 'section': 'right',
                                 'type': 'ROW'
                             }
                 
-                if country_str not in index:
-                    index[country_str] = {}
-                
-                index[country_str][service] = {
+                index_setdefault(country_str, {})[service] = {
                     'sheet': sheet_name,
                     'row': row,
                     'section': section,
@@ -2,12 +2,100 @@
 Base carrier class defining the interface all carrier modules must implement.
 """
 
+import unicodedata
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, List, Mapping, Tuple, Optional
 
 
-@dataclass
+# Canonical service/format names. Identifier-like literals are interned by
+# CPython, so these are the same objects as the literals used elsewhere.
+_PRIORITY = 'Priority'
+_ECONOMY = 'Economy'
+_LETTERS = 'Letters'
+_FLATS = 'Flats'
+_PACKETS = 'Packets'
+
+# Exact-match shortcuts for the values carrier sheets almost always contain,
+# checked before any lowercasing. Results must agree with the helpers below.
+_SERVICE_EXACT = {
+    'Priority': 'Priority',
+    'Economy': 'Economy',
+    'Velociti': 'Priority',
+}
+
+_FORMAT_EXACT = {
+    'Letters': 'Letters',
+    'Letter': 'Letters',
+    'Flats': 'Flats',
+    'Flat': 'Flats',
+    'Packets': 'Packets',
+    'Packet': 'Packets',
+}
+
+# Template cell values treated as an empty total
+_EMPTY = frozenset((None, '', ' '))
+
+
+def _to_int(value) -> int:
+    """Template cell value as an int; None/empty/non-numeric count as 0."""
+    # Numeric cells (the usual case) skip the string checks
+    if isinstance(value, int):
+        return int(value)
+    if value in _EMPTY:
+        return 0
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _to_float(value) -> float:
+    """Template cell value as a float; None/empty/non-numeric count as 0.0."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value in _EMPTY:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+@lru_cache(maxsize=64)
+def _normalise_service(service: str) -> str:
+    """Cached service normalisation - carrier sheets repeat a handful of values."""
+    service_lower = service.lower().strip()
+    if 'priority' in service_lower:
+        return 'Priority'
+    elif 'velociti' in service_lower:
+        return 'Priority'
+    elif 'economy' in service_lower:
+        return 'Economy'
+    return service
+
+
+@lru_cache(maxsize=64)
+def _normalise_format(format_type: str) -> str:
+    """Cached format normalisation - carrier sheets repeat a handful of values."""
+    fmt_lower = format_type.lower().strip()
+    if 'letter' in fmt_lower:
+        return 'Letters'
+    elif 'flat' in fmt_lower or 'boxable' in fmt_lower:
+        return 'Flats'
+    elif 'packet' in fmt_lower or 'non-boxable' in fmt_lower or 'nonboxable' in fmt_lower:
+        return 'Packets'
+    return format_type
+
+
+@lru_cache(maxsize=512)
+def fold_country(name: str) -> str:
+    """Fold a country name to unaccented lower case for lookup."""
+    return unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().strip().lower()
+
+
+@dataclass(slots=True)
 class ShipmentRecord:
     """Standardised shipment record from carrier sheet."""
     country: str
@@ -17,9 +105,9 @@ class ShipmentRecord:
     weight: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlacementResult:
-    """Result of placing a record in the manifest."""
+    """Result of placing a record in the manifest (immutable, so results can be shared)."""
     success: bool
     sheet_name: str = ""
     row: int = 0
@@ -39,8 +127,15 @@ class BaseCarrier(ABC):
     service_map: Dict[str, str] = {}
     
     def __init__(self):
-        self.country_mapping: Dict[str, str] = {}
+        self.country_mapping: Mapping[str, str] = {}
         self.errors: List[str] = []
+        # Template file the engine loaded for the current run, if known
+        self.template_path: Optional[str] = None
+        # Pending totals: (sheet, row, items_col, weight_col) -> [items, grams]
+        self._pending: Dict[Tuple[str, int, int, int], list] = {}
+        # (country, service) -> location view of the last country index placed against
+        self._flat_index_source: Optional[dict] = None
+        self._flat_index: Dict[Tuple[str, str], dict] = {}
     
     @abstractmethod
     def build_country_index(self, workbook) -> Dict[str, dict]:
@@ -85,59 +180,53 @@ class BaseCarrier(ABC):
     
     def normalise_service(self, service: str) -> str:
         """Convert carrier sheet service name to 'Priority' or 'Economy'."""
-        service_lower = service.lower().strip()
-        if 'priority' in service_lower:
-            return 'Priority'
-        elif 'velociti' in service_lower:
-            return 'Priority'
-        elif 'economy' in service_lower:
-            return 'Economy'
-        return service
+        # Canonical values (the literals used as index keys) pass straight through
+        if service is _PRIORITY or service is _ECONOMY:
+            return service
+        hit = _SERVICE_EXACT.get(service)
+        if hit is not None:
+            return hit
+        return _normalise_service(service)
     
     def normalise_format(self, format_type: str) -> str:
         """Normalise format name to standard: Letters, Flats, Packets."""
-        fmt_lower = format_type.lower().strip()
-        if 'letter' in fmt_lower:
-            return 'Letters'
-        elif 'flat' in fmt_lower or 'boxable' in fmt_lower:
-            return 'Flats'
-        elif 'packet' in fmt_lower or 'non-boxable' in fmt_lower or 'nonboxable' in fmt_lower:
-            return 'Packets'
-        return format_type
+        if format_type is _LETTERS or format_type is _FLATS or format_type is _PACKETS:
+            return format_type
+        hit = _FORMAT_EXACT.get(format_type)
+        if hit is not None:
+            return hit
+        return _normalise_format(format_type)
     
     def map_country(self, carrier_country: str) -> Optional[str]:
         """Map carrier sheet country name to manifest country name."""
-        if carrier_country in self.country_mapping:
-            return self.country_mapping[carrier_country]
-        return carrier_country
+        return self.country_mapping.get(carrier_country, carrier_country)
     
     def place_record(self, workbook, record: ShipmentRecord, country_index: dict) -> PlacementResult:
         """
         Place a shipment record into the manifest.
         
+        Totals are accumulated per target cell and written to the workbook
+        by flush_to_workbook() once all records have been placed.
+        
         Returns PlacementResult indicating success/failure.
         """
         manifest_country = self.map_country(record.country)
-        
-        if manifest_country not in country_index:
-            return PlacementResult(
-                success=False,
-                error_message=f"Country not found in manifest: {record.country} (mapped to: {manifest_country})"
-            )
-        
         service = self.normalise_service(record.service)
         format_type = self.normalise_format(record.format)
         
-        country_data = country_index[manifest_country]
+        location = self._flat_country_index(country_index).get((manifest_country, service))
         
-        if service not in country_data:
+        if location is None:
+            if manifest_country not in country_index:
+                return PlacementResult(
+                    success=False,
+                    error_message=f"Country not found in manifest: {record.country} (mapped to: {manifest_country})"
+                )
             return PlacementResult(
                 success=False,
                 error_message=f"Service '{service}' not available for {manifest_country}"
             )
         
-        location = country_data[service]
-        sheet = workbook[location['sheet']]
         row = location['row']
         
         try:
@@ -148,24 +237,7 @@ class BaseCarrier(ABC):
                 error_message=str(e)
             )
         
-        # Get current values (may be None, empty string, or already have data)
-        current_items_raw = sheet.cell(row=row, column=items_col).value
-        current_weight_raw = sheet.cell(row=row, column=weight_col).value
-        
-        # Convert to numeric, treating None/empty/non-numeric as 0
-        try:
-            current_items = int(current_items_raw) if current_items_raw not in (None, '', ' ') else 0
-        except (ValueError, TypeError):
-            current_items = 0
-        
-        try:
-            current_weight = float(current_weight_raw) if current_weight_raw not in (None, '', ' ') else 0.0
-        except (ValueError, TypeError):
-            current_weight = 0.0
-        
-        # Add to existing values
-        sheet.cell(row=row, column=items_col).value = current_items + record.items
-        sheet.cell(row=row, column=weight_col).value = round(current_weight + record.weight, 3)
+        self._accumulate(location['sheet'], row, items_col, weight_col, record.items, record.weight)
         
         return PlacementResult(
             success=True,
@@ -174,3 +246,67 @@ class BaseCarrier(ABC):
             items_col=items_col,
             weight_col=weight_col
         )
+    
+    def _flat_country_index(self, country_index: dict) -> Dict[Tuple[str, str], dict]:
+        """
+        Return a (country, service) -> location view of country_index.
+        
+        Built once per index so each record needs a single lookup; the
+        nested index stays the interface carriers implement.
+        """
+        if country_index is not self._flat_index_source:
+            self._flat_index = {
+                (country, service): location
+                for country, services in country_index.items()
+                for service, location in services.items()
+            }
+            self._flat_index_source = country_index
+        return self._flat_index
+    
+    def _accumulate(self, sheet_name: str, row: int, items_col: int, weight_col: int,
+                    items: int, weight: float) -> None:
+        """
+        Add a record's items and weight to the pending totals for a cell pair.
+        
+        Weight is held in integer grams so repeated additions stay exact;
+        it is converted back to kg once, when the totals are flushed.
+        """
+        key = (sheet_name, row, items_col, weight_col)
+        grams = int(round(weight * 1000))
+        totals = self._pending.get(key)
+        if totals is None:
+            self._pending[key] = [items, grams]
+        else:
+            totals[0] += items
+            totals[1] += grams
+    
+    def flush_to_workbook(self, workbook) -> None:
+        """
+        Write totals accumulated by place_record() into the manifest.
+        
+        Each target cell is read and written once, adding to any value
+        already present in the template.
+        """
+        # Workbook lookups by name scan the sheet list; resolve each once
+        sheets = {}
+        for (sheet_name, row, items_col, weight_col), (items, grams) in self._pending.items():
+            sheet = sheets.get(sheet_name)
+            if sheet is None:
+                sheet = sheets[sheet_name] = workbook[sheet_name]
+            
+            items_cell = sheet.cell(row=row, column=items_col)
+            weight_cell = sheet.cell(row=row, column=weight_col)
+            
+            # Get current values (may be None, empty string, or already have data)
+            current_items_raw = items_cell.value
+            current_weight_raw = weight_cell.value
+            
+            # Convert to numeric, treating None/empty/non-numeric as 0
+            current_items = _to_int(current_items_raw)
+            current_weight = _to_float(current_weight_raw)
+            
+            # Add to existing values
+            items_cell.value = current_items + items
+            weight_cell.value = (int(round(current_weight * 1000)) + grams) / 1000
+        
+        self._pending.clear()
@@ -45,12 +45,14 @@ class DeutschePostCarrier(BaseCarrier):
     # Format mapping for portal dropdown
     # Portal options are: P, G, E, mixed (P/G/E)
     # P = Letters, G = Flats/Large Letters, E = Packets
-    FORMAT_MAP = {
-        frozenset(['Letters']): 'P',
-        frozenset(['Flats']): 'G',
-        frozenset(['Packets']): 'E',
-        # Any combination with multiple formats = Mixed
-    }
+    # One bit per format; unrecognised formats get their own bit so they
+    # always fall through to Mixed
+    FORMAT_BITS = {'Letters': 1, 'Flats': 2, 'Packets': 4}
+    UNKNOWN_FORMAT_BIT = 8
+    
+    # Single-format masks -> portal value. Any other mask (several formats,
+    # an unrecognised format, or none at all) = Mixed
+    FORMAT_MAP = {1: 'P', 2: 'G', 4: 'E'}
     
     def __init__(self):
         super().__init__()
@@ -67,39 +69,37 @@ class DeutschePostCarrier(BaseCarrier):
         Returns:
             DeutschePostData with PO, weight, items, formats
         """
-        wb = load_workbook(carrier_sheet_path, data_only=True)
-        ws = wb['Manifest']
-        
-        # Get PO number from B4
-        po_raw = ws.cell(row=4, column=2).value
-        po_number = str(int(po_raw)) if isinstance(po_raw, (int, float)) else str(po_raw or "")
-        
-        # Find totals row (last row with data in Items/Weight columns)
-        total_weight = 0.0
-        total_items = 0
-        formats = set()
-        
-        # Data starts at row 9, iterate until we hit empty country
-        for row in range(9, ws.max_row + 1):
-            country = ws.cell(row=row, column=1).value
+        wb = load_workbook(carrier_sheet_path, read_only=True, data_only=True)
+        try:
+            ws = wb['Manifest']
+            
+            # Get PO number from B4
+            po_raw = ws['B4'].value
+            po_number = str(int(po_raw)) if isinstance(po_raw, (int, float)) else str(po_raw or "")
             
-            # Check if this is a data row or totals row
-            if country is None or str(country).strip() == '':
-                # This should be the totals row
-                items_val = ws.cell(row=row, column=5).value
-                weight_val = ws.cell(row=row, column=6).value
-                if items_val is not None:
-                    total_items = int(items_val)
-                if weight_val is not None:
-                    total_weight = float(weight_val)
-                break
-            else:
+            # Find totals row (last row with data in Items/Weight columns)
+            total_weight = 0.0
+            total_items = 0
+            formats = set()
+            normalise_format = self.normalise_format
+            
+            # Data starts at row 9, iterate until we hit empty country
+            for country, _, _, fmt, items_val, weight_val in ws.iter_rows(
+                    min_row=9, max_col=6, values_only=True):
+                # Check if this is a data row or totals row
+                if country is None or (country.strip() if type(country) is str
+                                       else str(country).strip()) == '':
+                    # This should be the totals row
+                    if items_val is not None:
+                        total_items = int(items_val)
+                    if weight_val is not None:
+                        total_weight = float(weight_val)
+                    break
                 # This is a data row - collect format
-                fmt = ws.cell(row=row, column=4).value
                 if fmt:
-                    formats.add(self.normalise_format(str(fmt)))
-        
-        wb.close()
+                    formats.add(normalise_format(str(fmt)))
+        finally:
+            wb.close()
         
         return DeutschePostData(
             po_number=po_number,
@@ -118,14 +118,14 @@ class DeutschePostCarrier(BaseCarrier):
         Returns:
             Format string for portal
         """
-        formats_frozen = frozenset(formats)
-        
-        # Check for single format
-        if formats_frozen in self.FORMAT_MAP:
-            return self.FORMAT_MAP[formats_frozen]
+        format_bits = self.FORMAT_BITS
+        unknown_bit = self.UNKNOWN_FORMAT_BIT
+        mask = 0
+        for fmt in formats:
+            mask |= format_bits.get(fmt, unknown_bit)
         
-        # Multiple formats = Mixed
-        return "mixed (P/G/E)"
+        # Single format maps directly, multiple formats = Mixed
+        return self.FORMAT_MAP.get(mask, "mixed (P/G/E)")
     
     def process_carrier_sheet(self, input_path: str, output_dir: str) -> Tuple[str, DeutschePostData]:
         """
@@ -145,8 +145,8 @@ class DeutschePostCarrier(BaseCarrier):
         data = self.extract_data(input_path)
         self._extracted_data = data
         
-        # Load workbook for modification
-        wb = load_workbook(input_path)
+        # Load workbook for modification (external link caches are not needed)
+        wb = load_workbook(input_path, keep_links=False)
         
         # Remove (EMB) Manifest sheet if it exists
         if '(EMB) Manifest' in wb.sheetnames:
@@ -11,14 +11,285 @@ Handles the Deutsche Post business portal workflow:
 """
 
 import os
+import re
+import random
 import asyncio
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable, Optional
 
-from core.credentials import get_deutschepost_credentials
+from core.credentials import PortalCredentials, get_deutschepost_credentials
+
+try:
+    from playwright.async_api import async_playwright
+    from playwright.async_api import Error as PlaywrightError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PlaywrightError = Exception
+    PlaywrightTimeoutError = TimeoutError
+    PLAYWRIGHT_AVAILABLE = False
+
+
+# Portal constants
+LOGIN_URL = "https://packet.deutschepost.com/webapp/index.xhtml"
+
+# Run Chromium headless unless DP_PORTAL_HEADLESS=0 (useful for watching or
+# debugging the portal flow; failures also leave dp_debug_*.png screenshots)
+HEADLESS_DEFAULT = os.environ.get("DP_PORTAL_HEADLESS", "1").strip().lower() not in ("0", "false", "no")
+
+# Turn off Chromium background services (updates, safe browsing, sync...)
+# that slow start-up and add network traffic during the session
+CHROMIUM_ARGS = [
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-breakpad",
+    "--disable-client-side-phishing-detection",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-hang-monitor",
+    "--disable-ipc-flooding-protection",
+    "--disable-popup-blocking",
+    "--disable-prompt-on-repost",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--disable-translate",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--safebrowsing-disable-auto-update",
+]
+
+CREDENTIALS_MISSING_MESSAGE = (
+    "Deutsche Post credentials not configured. "
+    "Set DEUTSCHEPOST_EMAIL and DEUTSCHEPOST_PASSWORD in .env file."
+)
+
+# Delay before each retry after a portal timeout (plus up to 0.5 s jitter)
+RETRY_BACKOFF_S = (1.0, 2.0, 4.0)
+
+# Time given to Adobe to spool the print job before it is closed
+ADOBE_CLOSE_DELAY_S = 7
+
+# Saved cookies/local storage from the last successful login, so later
+# runs can skip the login form while the portal session is still valid
+SESSION_STATE_FILE = os.path.join(
+    os.environ.get("LOCALAPPDATA", os.path.expanduser("~")),
+    "MultiCarrierManifestTool", "deutschepost-portal-state.json"
+)
+
+# Set by the OneTrust banner once consent is given; when the context already
+# carries it the banner is not shown and the probe is skipped
+COOKIE_CONSENT_COOKIE = "OptanonAlertBoxClosed"
+# The banner is injected after the login form renders, sometimes late;
+# the Login click waits for this probe to finish
+COOKIE_BANNER_WAIT_MS = 2000
+
+# Selector alternatives are combined into one CSS union per step, so
+# whichever variant the portal renders is matched in a single query
+COOKIE_SELECTORS = [
+    'button:has-text("Accept")',
+    'button:has-text("Accept all")',
+    'button:has-text("Alle akzeptieren")',
+    '#onetrust-accept-btn-handler',
+]
+EMAIL_SELECTORS = [
+    'input[type="email"]',
+    'input[name="email"]',
+    'input[id*="email"]',
+    'input[name="username"]',
+]
+LOGIN_FORM_SELECTOR = 'input[type="password"]'
+LOGIN_SUBMIT_SELECTORS = [
+    'input[type="submit"]',
+    'button[type="submit"]',
+]
+FORM_INPUT_SELECTOR = 'input[type="text"]'
+# Portal validation messages ("Please enter a ...") shown on a rejected form
+VALIDATION_ERROR_SELECTOR = 'text=/please enter/i >> visible=true'
+MISSING_REFERENCE_SELECTOR = 'text=/please enter a customer reference/i >> visible=true'
+
+# Accessible names of the buttons/links for each step, matched through the
+# accessibility tree (get_by_role) instead of :has-text DOM text scans.
+# Submit inputs expose their value as the button name. Short names are
+# anchored so they do not also match longer labels such as "Shipments".
+LOGIN_NAME = re.compile(r"^\s*log ?in\s*$", re.IGNORECASE)
+SHIP_NAME = re.compile(r"^\s*Ship\s*$", re.IGNORECASE)
+PREPARE_AWB_NAME = re.compile(r"Prepare Airway Bills", re.IGNORECASE)
+PRINT_AWB_NAME = re.compile(r"Print Airway Bill", re.IGNORECASE)
+CREATE_NAME = re.compile(r"^\s*Create\s*$", re.IGNORECASE)
+
+# Fills the visible text inputs in page order (contact, job reference,
+# weight) and fires input/change events so the form registers the values.
+# Returns the number of visible text inputs found.
+FILL_TEXT_INPUTS_JS = """
+(values) => {
+    const inputs = [...document.querySelectorAll('input[type="text"]')]
+        .filter(el => el.offsetParent !== null);
+    const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    values.forEach((value, i) => {
+        const el = inputs[i];
+        if (!el) return;
+        setValue.call(el, value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    });
+    return inputs.length;
+}
+"""
+
+
+async def _wait_for_step(page, locator, timeout_ms: int) -> None:
+    """
+    Wait for the DOM to load and the next step's element to become visible.
+    
+    Used instead of networkidle, which stalls on the portal's background
+    requests. Raises PlaywrightTimeoutError if the step does not load in
+    time, so a slow portal is retried rather than reported as a missing
+    button.
+    """
+    await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+    await locator.first.wait_for(state="visible", timeout=timeout_ms)
+
+
+def _move_download(temp_path: str, dest_path: str) -> None:
+    """
+    Move Playwright's temporary download file to its destination.
+    
+    A rename when both are on the same drive; otherwise a copy with a
+    large buffer (the temp file is removed with the browser context).
+    """
+    try:
+        os.replace(temp_path, dest_path)
+    except OSError:
+        with open(temp_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+
+
+def _close_adobe() -> None:
+    """Kill Adobe Acrobat/Reader left open by the print verb (fire and forget)."""
+    for image in ('Acrobat.exe', 'AcroRd32.exe'):
+        try:
+            subprocess.Popen(['taskkill', '/F', '/IM', image],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            pass
+
+
+def _schedule_adobe_close(delay_s: float) -> None:
+    """Close Adobe once the print job has been handed over, without blocking."""
+    timer = threading.Timer(delay_s, _close_adobe)
+    timer.daemon = True
+    timer.start()
+
+
+@lru_cache(maxsize=1)
+def _cached_credentials() -> PortalCredentials:
+    """Deutsche Post credentials, read once per session."""
+    return get_deutschepost_credentials()
+
+
+def _load_credentials() -> Optional[PortalCredentials]:
+    """Cached credentials, or None if incomplete."""
+    creds = _cached_credentials()
+    if not creds.is_valid():
+        return None
+    return creds
+
+
+async def _save_session_state(context) -> None:
+    """Persist the logged-in context state for the next run (best effort)."""
+    try:
+        os.makedirs(os.path.dirname(SESSION_STATE_FILE), exist_ok=True)
+        await context.storage_state(path=SESSION_STATE_FILE)
+    except Exception:
+        pass
+
+
+def _discard_session_state() -> None:
+    """Remove saved session state, e.g. after it failed to get us logged in."""
+    try:
+        os.remove(SESSION_STATE_FILE)
+    except OSError:
+        pass
+
+
+async def _new_context(browser):
+    """
+    Open a browser context, restoring the saved session state if present.
+    
+    A state file that cannot be read or parsed (e.g. truncated by a crash
+    mid-write) is discarded and a clean context is opened instead, so one
+    bad file does not fail every later upload.
+    """
+    if os.path.exists(SESSION_STATE_FILE):
+        try:
+            return await browser.new_context(accept_downloads=True, storage_state=SESSION_STATE_FILE)
+        except (OSError, ValueError, PlaywrightError):
+            _discard_session_state()
+    return await browser.new_context(accept_downloads=True)
+
+
+def _visible_union(selectors: list) -> str:
+    """Combine selector alternatives into one CSS union of visible matches."""
+    return ", ".join(f"{selector}:visible" for selector in selectors)
+
+
+async def _wait_visible(locator, timeout_ms: int) -> bool:
+    """Wait for the locator to become visible; False if it does not in time."""
+    try:
+        await locator.wait_for(state="visible", timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def _click_for_download(page, button, timeout_ms: int):
+    """
+    Click a button that should start a download and return the Download.
+    
+    Raises if no download starts within the timeout. The portal's "please
+    enter" validation message is left to the caller to check after that:
+    the form can show "please enter" hint text while it is valid, so the
+    text alone does not mean the form was rejected.
+    """
+    async with page.expect_download(timeout=timeout_ms) as download_info:
+        await button.click()
+    return await download_info.value
+
+
+def _role_locator(page, name, roles=("button", "link")):
+    """Locate buttons/links by accessible name, in any of the given roles."""
+    locator = page.get_by_role(roles[0], name=name)
+    for role in roles[1:]:
+        locator = locator.or_(page.get_by_role(role, name=name))
+    return locator
+
+
+async def _click_first_visible(locator, timeout_ms: int) -> bool:
+    """
+    Click the first visible element matched by the locator.
+    
+    Returns False if no matching element becomes visible within the
+    timeout. A matched element whose click times out (e.g. behind an
+    overlay) raises PlaywrightTimeoutError instead of passing for a
+    missing button.
+    """
+    element = locator.first
+    if not await _wait_visible(element, timeout_ms):
+        return False
+    await element.click(timeout=timeout_ms)
+    return True
 
 
 async def _upload_to_deutschepost_portal_impl(
+    browser,
+    creds: PortalCredentials,
     po_number: str,
     total_weight: float,
     item_format: str,
@@ -30,23 +301,16 @@ async def _upload_to_deutschepost_portal_impl(
     """
     Internal implementation of Deutsche Post portal registration.
     
+    Runs one attempt in a fresh context on an already launched browser.
+    
     Args:
+        browser: Playwright browser shared by all attempts of one upload
+        creds: Validated Deutsche Post portal credentials
         item_format: One of 'P', 'G', 'E', or 'mixed (P/G/E)'
     """
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        return False, "Playwright not installed. Run: pip install playwright && playwright install chromium"
-    
-    # Load credentials from environment/.env
-    creds = get_deutschepost_credentials()
-    if not creds.is_valid():
-        return False, "Deutsche Post credentials not configured. Set DEUTSCHEPOST_EMAIL and DEUTSCHEPOST_PASSWORD in .env file."
-    
     EMAIL = creds.email
     PASSWORD = creds.password
     CONTACT_NAME = creds.contact_name
-    LOGIN_URL = "https://packet.deutschepost.com/webapp/index.xhtml"
     
     def log(msg):
         if log_callback:
@@ -55,361 +319,259 @@ async def _upload_to_deutschepost_portal_impl(
     downloaded_file = None
     
     try:
-        async with async_playwright() as p:
-            # Launch browser
-            log("  Launching browser...")
-            browser = await p.chromium.launch(headless=False)
-            context = await browser.new_context(accept_downloads=True)
-            page = await context.new_page()
+        context = await _new_context(browser)
+        page = await context.new_page()
+        
+        try:
+            # Navigate to login page
+            log("  Navigating to Deutsche Post portal...")
+            await page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=timeout_ms)
+            # A saved session lands straight on the portal, otherwise on the login form
+            ship_link = _role_locator(page, SHIP_NAME, roles=("link",))
+            await _wait_for_step(page, page.locator(LOGIN_FORM_SELECTOR).or_(ship_link), timeout_ms)
             
-            try:
-                # Navigate to login page
-                log("  Navigating to Deutsche Post portal...")
-                await page.goto(LOGIN_URL, wait_until="networkidle", timeout=timeout_ms)
-                
+            if await ship_link.first.is_visible():
+                log("  ✓ Reusing saved portal session")
+            else:
                 # Handle cookie consent banner if present
                 log("  Checking for cookie consent...")
-                cookie_selectors = [
-                    'button:has-text("Accept")',
-                    'button:has-text("Accept all")',
-                    'button:has-text("Alle akzeptieren")',
-                    '#onetrust-accept-btn-handler',
-                ]
-                
-                for selector in cookie_selectors:
-                    try:
-                        element = page.locator(selector).first
-                        if await element.is_visible(timeout=2000):
-                            await element.click()
-                            log("    ✓ Cookie consent accepted")
-                            await page.wait_for_timeout(1000)
-                            break
-                    except Exception:
-                        continue
-                
-                await page.wait_for_timeout(2000)
+                consent_given = any(
+                    cookie["name"] == COOKIE_CONSENT_COOKIE
+                    for cookie in await context.cookies(LOGIN_URL)
+                )
+                cookie_task = None
+                if consent_given:
+                    log("    ✓ Cookie consent already given")
+                else:
+                    # Runs alongside the credential fills; fill() is not blocked
+                    # by the banner overlay, the Login click below is, so the
+                    # probe is awaited before clicking
+                    cookie_task = asyncio.ensure_future(_click_first_visible(
+                        page.locator(_visible_union(COOKIE_SELECTORS)), COOKIE_BANNER_WAIT_MS))
                 
                 # Enter email
                 log("  Entering credentials...")
-                email_selectors = [
-                    'input[type="email"]',
-                    'input[name="email"]',
-                    'input[id*="email"]',
-                    'input[name="username"]',
-                ]
-                
-                for selector in email_selectors:
-                    try:
-                        element = page.locator(selector).first
-                        if await element.is_visible(timeout=2000):
-                            await element.fill(EMAIL)
-                            log("    ✓ Email entered")
-                            break
-                    except Exception:
-                        continue
+                try:
+                    await page.locator(_visible_union(EMAIL_SELECTORS)).first.fill(EMAIL, timeout=2000)
+                    log("    ✓ Email entered")
+                except Exception:
+                    pass
                 
                 # Enter password
                 try:
-                    password_field = page.locator('input[type="password"]').first
-                    if await password_field.is_visible(timeout=2000):
+                    password_field = page.locator(LOGIN_FORM_SELECTOR).first
+                    if await _wait_visible(password_field, 2000):
                         await password_field.fill(PASSWORD)
                         log("    ✓ Password entered")
                 except Exception:
                     pass
                 
+                if cookie_task is not None and await cookie_task:
+                    log("    ✓ Cookie consent accepted")
+                
                 # Click Login button
                 log("  Clicking Login...")
-                login_selectors = [
-                    'button:has-text("Login")',
-                    'button:has-text("Log in")',
-                    'input[type="submit"]',
-                    'button[type="submit"]',
-                ]
-                
-                clicked = False
-                for selector in login_selectors:
-                    try:
-                        element = page.locator(selector).first
-                        if await element.is_visible(timeout=2000):
-                            await element.click()
-                            clicked = True
-                            break
-                    except Exception:
-                        continue
-                
-                if not clicked:
+                login_button = _role_locator(page, LOGIN_NAME, roles=("button",)).or_(
+                    page.locator(_visible_union(LOGIN_SUBMIT_SELECTORS)))
+                if not await _click_first_visible(login_button, 2000):
                     screenshot_path = os.path.join(output_dir, "dp_debug_login.png")
                     await page.screenshot(path=screenshot_path)
-                    await browser.close()
+                    await context.close()
+                    _discard_session_state()
                     return False, "Could not find Login button. Check dp_debug_login.png"
                 
-                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
-                await page.wait_for_timeout(3000)
-                
-                log("  ✓ Logged in successfully")
-                
-                # Step 1: Click "Ship" in navigation menu
-                log("  Clicking Ship menu...")
                 try:
-                    ship_link = page.locator('a:has-text("Ship")').first
-                    if await ship_link.is_visible(timeout=5000):
-                        await ship_link.click()
-                        log("    ✓ Clicked Ship")
-                except Exception as e:
-                    log(f"    Note: Ship menu click issue - {e}")
-                
-                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
-                await page.wait_for_timeout(2000)
-                
-                # Step 2: Click "Prepare Airway Bills" button
-                log("  Clicking Prepare Airway Bills...")
-                awb_button_selectors = [
-                    'input[value="Prepare Airway Bills"]',
-                    'button:has-text("Prepare Airway Bills")',
-                    'a:has-text("Prepare Airway Bills")',
-                ]
-                
-                clicked = False
-                for selector in awb_button_selectors:
-                    try:
-                        elements = page.locator(selector)
-                        count = await elements.count()
-                        for i in range(count):
-                            el = elements.nth(i)
-                            if await el.is_visible(timeout=1000):
-                                tag = await el.evaluate("el => el.tagName.toLowerCase()")
-                                if tag in ['input', 'button', 'a']:
-                                    await el.click()
-                                    clicked = True
-                                    log("    ✓ Clicked Prepare Airway Bills")
-                                    break
-                        if clicked:
-                            break
-                    except Exception:
-                        continue
-
-                if not clicked:
-                    screenshot_path = os.path.join(output_dir, "dp_debug_prepare_awb.png")
+                    await _wait_for_step(page, ship_link, timeout_ms)
+                except PlaywrightTimeoutError:
+                    if not await page.locator(LOGIN_FORM_SELECTOR).first.is_visible():
+                        raise  # Slow portal rather than a rejected login - retry
+                    # Still on the login form: the credentials were rejected
+                    screenshot_path = os.path.join(output_dir, "dp_debug_login.png")
                     await page.screenshot(path=screenshot_path)
-                    await browser.close()
-                    return False, "Could not find Prepare Airway Bills button. Check dp_debug_prepare_awb.png"
-                
-                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
-                await page.wait_for_timeout(2000)
-                
-                # Step 3: Click "Print Airway Bill" button
-                log("  Clicking Print Airway Bill...")
-                print_awb_selectors = [
-                    'input[value="Print Airway Bill"]',
-                    'button:has-text("Print Airway Bill")',
-                    'a:has-text("Print Airway Bill")',
-                ]
+                    await context.close()
+                    _discard_session_state()
+                    return False, ("Login failed - portal did not accept the credentials. "
+                                   "Check DEUTSCHEPOST_EMAIL/DEUTSCHEPOST_PASSWORD and dp_debug_login.png")
+                await _save_session_state(context)
                 
-                clicked = False
-                for selector in print_awb_selectors:
-                    try:
-                        elements = page.locator(selector)
-                        count = await elements.count()
-                        for i in range(count):
-                            el = elements.nth(i)
-                            if await el.is_visible(timeout=1000):
-                                await el.click()
-                                clicked = True
-                                log("    ✓ Clicked Print Airway Bill")
-                                break
-                        if clicked:
-                            break
-                    except Exception:
-                        continue
+                log("  ✓ Logged in successfully")
+            
+            # Step 1: Click "Ship" in navigation menu
+            log("  Clicking Ship menu...")
+            try:
+                if await _wait_visible(ship_link.first, 5000):
+                    await ship_link.first.click()
+                    log("    ✓ Clicked Ship")
+            except PlaywrightTimeoutError:
+                raise
+            except Exception as e:
+                log(f"    Note: Ship menu click issue - {e}")
+            
+            prepare_awb_button = _role_locator(page, PREPARE_AWB_NAME)
+            await _wait_for_step(page, prepare_awb_button, timeout_ms)
+            
+            # Step 2: Click "Prepare Airway Bills" button
+            log("  Clicking Prepare Airway Bills...")
+            if await _click_first_visible(prepare_awb_button, 2000):
+                log("    ✓ Clicked Prepare Airway Bills")
+            else:
+                screenshot_path = os.path.join(output_dir, "dp_debug_prepare_awb.png")
+                await page.screenshot(path=screenshot_path)
+                await context.close()
+                return False, "Could not find Prepare Airway Bills button. Check dp_debug_prepare_awb.png"
+            
+            print_awb_button = _role_locator(page, PRINT_AWB_NAME)
+            await _wait_for_step(page, print_awb_button, timeout_ms)
+            
+            # Step 3: Click "Print Airway Bill" button
+            log("  Clicking Print Airway Bill...")
+            if await _click_first_visible(print_awb_button, 2000):
+                log("    ✓ Clicked Print Airway Bill")
+            else:
+                screenshot_path = os.path.join(output_dir, "dp_debug_print_awb.png")
+                await page.screenshot(path=screenshot_path)
+                await context.close()
+                return False, "Could not find Print Airway Bill button. Check dp_debug_print_awb.png"
+            
+            await _wait_for_step(page, page.locator(FORM_INPUT_SELECTOR), timeout_ms)
+            
+            # Step 4: Fill in the form
+            # The form is a table with rows. Each row has a label and an input.
+            # We need to find inputs by their position/order since labels may not have proper associations
+            log("  Filling in form...")
+            
+            # Handle dropdowns first: Product, Service Level, Item Format
+            try:
+                all_selects = page.locator('select:visible')
+                select_count = await all_selects.count()
+                log(f"      Found {select_count} dropdowns")
 
-                if not clicked:
-                    screenshot_path = os.path.join(output_dir, "dp_debug_print_awb.png")
-                    await page.screenshot(path=screenshot_path)
-                    await browser.close()
-                    return False, "Could not find Print Airway Bill button. Check dp_debug_print_awb.png"
-                
-                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
-                await page.wait_for_timeout(2000)
-                
-                # Step 4: Fill in the form
-                # The form is a table with rows. Each row has a label and an input.
-                # We need to find inputs by their position/order since labels may not have proper associations
-                log("  Filling in form...")
-                
-                # Get all visible text inputs in order
-                all_text_inputs = page.locator('input[type="text"]:visible')
-                input_count = await all_text_inputs.count()
+                if select_count >= 3:
+                    # Product dropdown (1st select) - change from "Packet" to "Business Mail"
+                    log("    Setting Product to Business Mail...")
+                    product_select = all_selects.nth(0)
+                    await product_select.select_option(label="Business Mail")
+                    log("      ✓ Product set to Business Mail")
+
+                    # Service Level dropdown (2nd select) - leave at default "Priority"
+                    # No action needed, defaults to Priority
+
+                    # Item Format dropdown (3rd select) - options are P, G, E, mixed (P/G/E)
+                    log(f"    Item format: {item_format}")
+                    format_select = all_selects.nth(2)
+                    await format_select.select_option(label=item_format)
+                    log(f"      ✓ Item Format set to: {item_format}")
+            except Exception as e:
+                log(f"      Dropdown selection error: {e}")
+            
+            # Text inputs are filled in one round trip. Based on the form structure:
+            # Input 0: Contact name
+            # Input 1: Your job reference
+            # Input 2: Total weight in kg
+            log(f"    Contact name: {CONTACT_NAME}")
+            log(f"    Job reference: {po_number}")
+            log(f"    Total weight: {total_weight} kg")
+            try:
+                input_count = await page.evaluate(FILL_TEXT_INPUTS_JS, [CONTACT_NAME, po_number, str(total_weight)])
                 log(f"    Found {input_count} text inputs")
+                if input_count >= 3:
+                    log("      ✓ Contact, reference and weight filled")
+                else:
+                    log(f"      ⚠ Expected 3 text inputs, filled {input_count}")
+            except Exception as e:
+                log(f"      ⚠ Form fill error: {e}")
+            
+            await page.wait_for_timeout(1000)
+            
+            # Check for validation errors before clicking Create
+            if await page.locator(MISSING_REFERENCE_SELECTOR).first.is_visible():
+                log("  ⚠ Validation error: Job reference not filled")
+                await context.close()
+                return False, "Failed to fill job reference field. Check dp_debug_form_filled.png"
+            
+            # Step 5: Click Create and wait for download
+            log("  Clicking Create...")
+            
+            try:
+                create_button = _role_locator(page, CREATE_NAME, roles=("button",)).first
+                if not await _wait_visible(create_button, 3000):
+                    screenshot_path = os.path.join(output_dir, "dp_debug_create.png")
+                    await page.screenshot(path=screenshot_path)
+                    await context.close()
+                    return False, "Could not find Create button. Check dp_debug_create.png"
                 
-                # Based on the form structure:
-                # Input 0: Contact name
-                # Input 1: Your job reference
-                # Input 2: Total weight in kg
-                
-                # Fill Contact name (first text input)
-                log(f"    Contact name: {CONTACT_NAME}")
-                try:
-                    contact_input = all_text_inputs.nth(0)
-                    await contact_input.click()
-                    await page.wait_for_timeout(200)
-                    await contact_input.fill(CONTACT_NAME)
-                    await page.wait_for_timeout(200)
-                    log("      ✓ Contact filled")
-                except Exception as e:
-                    log(f"      ⚠ Contact error: {e}")
-                
-                # Fill Job reference (second text input)
-                log(f"    Job reference: {po_number}")
-                try:
-                    ref_input = all_text_inputs.nth(1)
-                    await ref_input.click()
-                    await page.wait_for_timeout(200)
-                    await ref_input.fill(po_number)
-                    await page.wait_for_timeout(200)
-                    log("      ✓ Reference filled")
-                except Exception as e:
-                    log(f"      ⚠ Reference error: {e}")
-                
-                # Handle dropdowns: Product, Service Level, Item Format
-                try:
-                    all_selects = page.locator('select:visible')
-                    select_count = await all_selects.count()
-                    log(f"      Found {select_count} dropdowns")
-
-                    if select_count >= 3:
-                        # Product dropdown (1st select) - change from "Packet" to "Business Mail"
-                        log("    Setting Product to Business Mail...")
-                        product_select = all_selects.nth(0)
-                        await product_select.click()
-                        await page.wait_for_timeout(200)
-                        await product_select.select_option(label="Business Mail")
-                        await page.wait_for_timeout(200)
-                        log("      ✓ Product set to Business Mail")
-
-                        # Service Level dropdown (2nd select) - leave at default "Priority"
-                        # No action needed, defaults to Priority
-
-                        # Item Format dropdown (3rd select) - options are P, G, E, mixed (P/G/E)
-                        log(f"    Item format: {item_format}")
-                        format_select = all_selects.nth(2)
-                        await format_select.click()
-                        await page.wait_for_timeout(200)
-                        await format_select.select_option(label=item_format)
-                        log(f"      ✓ Item Format set to: {item_format}")
-                except Exception as e:
-                    log(f"      Dropdown selection error: {e}")
+                download = await _click_for_download(page, create_button, timeout_ms)
+                log("    ✓ Clicked Create")
                 
-                # Total weight (third text input, after contact and reference)
-                log(f"    Total weight: {total_weight} kg")
-                try:
-                    weight_input = all_text_inputs.nth(2)
-                    await weight_input.click()
-                    await page.wait_for_timeout(200)
-                    await weight_input.fill(str(total_weight))
-                    await page.wait_for_timeout(200)
-                    log("      ✓ Weight filled")
-                except Exception as e:
-                    log(f"      Weight error: {e}")
+                # Save the downloaded file
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                downloaded_filename = f"Deutsche_Post_{po_number}_{timestamp}.pdf"
+                downloaded_path = os.path.join(output_dir, downloaded_filename)
+                _move_download(await download.path(), downloaded_path)
+                downloaded_file = downloaded_path
+                log(f"  ✓ Downloaded: {downloaded_filename}")
                 
-                await page.wait_for_timeout(1000)
+            except Exception as e:
+                log(f"  ⚠ Error after clicking Create: {e}")
                 
-                # Check for validation errors before clicking Create
-                page_content = await page.content()
-                if "please enter a customer reference" in page_content.lower():
-                    log("  ⚠ Validation error: Job reference not filled")
-                    await browser.close()
-                    return False, "Failed to fill job reference field. Check dp_debug_form_filled.png"
+                screenshot_path = os.path.join(output_dir, "dp_debug_after_create.png")
+                await page.screenshot(path=screenshot_path)
                 
-                # Step 5: Click Create and wait for download
-                log("  Clicking Create...")
+                if await page.locator(VALIDATION_ERROR_SELECTOR).first.is_visible():
+                    await context.close()
+                    return False, "Form validation failed - required field missing. Check dp_debug_after_create.png"
                 
+                await context.close()
+                message = f"Failed to download manifest. Check dp_debug_after_create.png. Error: {e}"
+                if isinstance(e, PlaywrightTimeoutError):
+                    # Transient - let the caller retry
+                    raise PlaywrightTimeoutError(message) from e
+                return False, message
+            
+            await context.close()
+            
+            # Print if enabled and file was downloaded
+            if auto_print and downloaded_file:
+                log("  Printing downloaded manifest...")
+                import ctypes
                 try:
-                    async with page.expect_download(timeout=timeout_ms) as download_info:
-                        create_button = page.locator('input[value="Create"], button:has-text("Create")').first
-                        if await create_button.is_visible(timeout=3000):
-                            await create_button.click()
-                            log("    ✓ Clicked Create")
-                        else:
-                            screenshot_path = os.path.join(output_dir, "dp_debug_create.png")
-                            await page.screenshot(path=screenshot_path)
-                            await browser.close()
-                            return False, "Could not find Create button. Check dp_debug_create.png"
-                    
-                    # Get the download
-                    download = await download_info.value
+                    # ShellExecuteW blocks until the PDF handler accepts the
+                    # job, so run it off the event loop
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        None, ctypes.windll.shell32.ShellExecuteW,
+                        None, "print", downloaded_file, None, None, 0
+                    )
+                    print_success = result > 32
+                    print_msg = "Sent to default printer" if print_success else f"Print failed with code {result}"
                     
-                    # Save the downloaded file
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    downloaded_filename = f"Deutsche_Post_{po_number}_{timestamp}.pdf"
-                    downloaded_path = os.path.join(output_dir, downloaded_filename)
-                    await download.save_as(downloaded_path)
-                    downloaded_file = downloaded_path
-                    log(f"  ✓ Downloaded: {downloaded_filename}")
-                    
-                except Exception as e:
-                    log(f"  ⚠ Error after clicking Create: {e}")
-                    
-                    screenshot_path = os.path.join(output_dir, "dp_debug_after_create.png")
-                    await page.screenshot(path=screenshot_path)
-                    
-                    page_content = await page.content()
-                    if "please enter" in page_content.lower():
-                        await browser.close()
-                        return False, "Form validation failed - required field missing. Check dp_debug_after_create.png"
-                    
-                    await browser.close()
-                    return False, f"Failed to download manifest. Check dp_debug_after_create.png. Error: {e}"
-                
-                await browser.close()
-                
-                # Print if enabled and file was downloaded
-                if auto_print and downloaded_file:
-                    log("  Printing downloaded manifest...")
-                    import ctypes
-                    import subprocess
-                    import time
-                    try:
-                        result = ctypes.windll.shell32.ShellExecuteW(
-                            None, "print", downloaded_file, None, None, 0
-                        )
-                        print_success = result > 32
-                        print_msg = "Sent to default printer" if print_success else f"Print failed with code {result}"
-                        
-                        # Close Adobe after printing (7 second delay)
-                        if print_success:
-                            def close_adobe_later():
-                                time.sleep(7)
-                                try:
-                                    subprocess.run(['taskkill', '/F', '/IM', 'Acrobat.exe'], 
-                                                 capture_output=True, timeout=5)
-                                    subprocess.run(['taskkill', '/F', '/IM', 'AcroRd32.exe'],
-                                                 capture_output=True, timeout=5)
-                                except Exception:
-                                    pass
-                            import threading
-                            threading.Thread(target=close_adobe_later, daemon=True).start()
-                            
-                    except Exception as print_err:
-                        print_success = False
-                        print_msg = str(print_err)
+                    # Close Adobe after printing (7 second delay)
                     if print_success:
-                        log(f"  ✓ {print_msg}")
-                        return True, "Manifest created, downloaded and printed successfully"
-                    else:
-                        log(f"  ⚠ {print_msg}")
-                        return True, f"Manifest created and downloaded. Print failed: {print_msg}"
-                elif downloaded_file:
-                    return True, "Manifest created and downloaded successfully"
+                        _schedule_adobe_close(ADOBE_CLOSE_DELAY_S)
+                        
+                except Exception as print_err:
+                    print_success = False
+                    print_msg = str(print_err)
+                if print_success:
+                    log(f"  ✓ {print_msg}")
+                    return True, "Manifest created, downloaded and printed successfully"
                 else:
-                    return False, "Failed to download manifest"
-                
-            except Exception as e:
-                try:
-                    await browser.close()
-                except Exception:
-                    pass
-                raise e
-                
+                    log(f"  ⚠ {print_msg}")
+                    return True, f"Manifest created and downloaded. Print failed: {print_msg}"
+            elif downloaded_file:
+                return True, "Manifest created and downloaded successfully"
+            else:
+                return False, "Failed to download manifest"
+            
+        except Exception as e:
+            try:
+                await context.close()
+            except Exception:
+                pass
+            raise e
+            
+    except PlaywrightTimeoutError:
+        # Transient - the caller decides whether to retry
+        raise
     except Exception as e:
         return False, f"Portal automation failed: {str(e)}"
 
@@ -422,37 +584,69 @@ async def upload_to_deutschepost_portal(
     auto_print: bool = True,
     log_callback: Optional[Callable[[str], None]] = None,
     timeout_ms: int = 30000,
-    retry_count: int = 1
+    retry_count: int = 1,
+    headless: Optional[bool] = None,
+    creds: Optional[PortalCredentials] = None
 ) -> tuple[bool, str]:
     """
     Register a manifest on the Deutsche Post portal using Playwright.
-    Includes automatic retry on timeout errors.
+    Includes automatic retry, with backoff, on Playwright timeouts only
+    (page and step loads, button clicks, the download); validation,
+    missing-element and credential failures are not retried.
+    
+    The browser is launched once and shared by the retries; each attempt
+    runs in its own context. headless defaults to DP_PORTAL_HEADLESS.
+    creds may be passed in by a caller that has already validated them.
     """
+    if headless is None:
+        headless = HEADLESS_DEFAULT
+    
+    if not PLAYWRIGHT_AVAILABLE:
+        return False, "Playwright not installed. Run: pip install playwright && playwright install chromium"
+    
+    if creds is None:
+        creds = _load_credentials()
+        if creds is None:
+            return False, CREDENTIALS_MISSING_MESSAGE
+    
     def log(msg):
         if log_callback:
             log_callback(msg)
     
     last_error = None
     
-    for attempt in range(retry_count + 1):
-        if attempt > 0:
-            log(f"\n  ⟳ Retry attempt {attempt} of {retry_count}...")
-        
-        success, message = await _upload_to_deutschepost_portal_impl(
-            po_number, total_weight, item_format, output_dir, 
-            auto_print, log_callback, timeout_ms
-        )
-        
-        if success:
-            return success, message
-        
-        last_error = message
-        if "Timeout" in message or "timeout" in message:
-            if attempt < retry_count:
-                log("  ⚠ Timeout occurred, will retry...")
-                continue
-        else:
-            break
+    try:
+        async with async_playwright() as p:
+            log("  Launching browser...")
+            browser = await p.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+            try:
+                for attempt in range(retry_count + 1):
+                    if attempt > 0:
+                        log(f"\n  ⟳ Retry attempt {attempt} of {retry_count}...")
+                    
+                    try:
+                        success, message = await _upload_to_deutschepost_portal_impl(
+                            browser, creds, po_number, total_weight, item_format,
+                            output_dir, auto_print, log_callback, timeout_ms
+                        )
+                    except PlaywrightTimeoutError as e:
+                        last_error = f"Portal automation failed: {str(e)}"
+                        if attempt < retry_count:
+                            delay = RETRY_BACKOFF_S[min(attempt, len(RETRY_BACKOFF_S) - 1)]
+                            log("  ⚠ Timeout occurred, will retry...")
+                            await asyncio.sleep(delay + random.random() * 0.5)
+                        continue
+                    
+                    if success:
+                        return success, message
+                    
+                    # Deterministic failure (validation, missing element) - don't retry
+                    last_error = message
+                    break
+            finally:
+                await browser.close()
+    except Exception as e:
+        return False, f"Portal automation failed: {str(e)}"
     
     return False, last_error or "Portal automation failed after retries"
 
@@ -468,17 +662,27 @@ def run_deutschepost_upload(
     """
     Synchronous wrapper for the async Deutsche Post portal function.
     """
+    # Validate credentials before paying for an event loop and a browser
+    creds = _load_credentials()
+    if creds is None:
+        return False, CREDENTIALS_MISSING_MESSAGE
+    
+    def run():
+        return asyncio.run(
+            upload_to_deutschepost_portal(
+                po_number, total_weight, item_format, output_dir,
+                auto_print, log_callback, creds=creds
+            )
+        )
+    
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         try:
-            return loop.run_until_complete(
-                upload_to_deutschepost_portal(
-                    po_number, total_weight, item_format, output_dir,
-                    auto_print, log_callback
-                )
-            )
-        finally:
-            loop.close()
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return run()
+        # Called from inside a running loop: blocking on it here would
+        # deadlock, so give the upload its own loop on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(run).result()
     except Exception as e:
         return False, f"Upload error: {str(e)}"
@@ -10,14 +10,14 @@ Economy (12SL03) and Priority (12SL02) must be in separate files.
 
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from itertools import chain
 from datetime import datetime, timedelta
 import os
-import pandas as pd
 
 from .base import BaseCarrier, ShipmentRecord, PlacementResult
 
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class LandmarkOrderLine:
     """A single order line for Landmark upload file."""
     iso_code: str
@@ -27,6 +27,12 @@ class LandmarkOrderLine:
     product_code: str  # 12SL03 (Economy) or 12SL02 (Priority)
 
 
+_ISO_NOT_LOADED = PlacementResult(
+    success=False,
+    error_message="ISO codes not loaded. Call load_iso_codes() first."
+)
+
+
 class LandmarkCarrier(BaseCarrier):
     """Handler for Landmark Global upload files."""
     
@@ -43,6 +49,16 @@ class LandmarkCarrier(BaseCarrier):
         'Economy': '12SL03',
     }
     
+    # Upload files, in the order they are written (product code -> service)
+    PRODUCT_SERVICES = {
+        '12SL03': 'Economy',
+        '12SL02': 'Priority',
+    }
+    
+    # Days to the next working day, by weekday (Monday=0 .. Sunday=6);
+    # Friday, Saturday and Sunday all roll forward to Monday
+    _NEXT_WORKING_DAY_OFFSET = (1, 1, 1, 1, 3, 2, 1)
+    
     # Format mapping (internal -> upload code)
     FORMAT_CODES = {
         'Letters': 'P',
@@ -52,11 +68,16 @@ class LandmarkCarrier(BaseCarrier):
     
     def __init__(self):
         super().__init__()
-        self._order_lines: List[LandmarkOrderLine] = []
+        self._lines_by_product: Dict[str, List[LandmarkOrderLine]] = {
+            code: [] for code in self.PRODUCT_SERVICES
+        }
         self._po_number = ""
         self._deposit_date = ""
         self._file_date = ""
         self._iso_map: Dict[str, str] = {}
+        # Raw sheet service/format values already resolved to upload codes
+        self._product_codes: Dict[str, str] = {}
+        self._format_codes: Dict[str, str] = {}
         self._iso_codes_loaded = False
     
     def load_iso_codes(self, filepath: str) -> bool:
@@ -70,13 +91,17 @@ class LandmarkCarrier(BaseCarrier):
             True if loaded successfully
         """
         try:
-            df_iso = pd.read_excel(filepath, sheet_name=1)
+            # pandas is only needed here; importing it lazily keeps
+            # `import carriers` light for callers that never touch Landmark
+            import pandas as pd
+            
+            df_iso = pd.read_excel(filepath, sheet_name=1,
+                                   usecols=['NAME', 'ISO_CODE'], dtype=str)
             
-            for _, row in df_iso.iterrows():
-                if pd.notna(row['NAME']) and pd.notna(row['ISO_CODE']):
-                    name = str(row['NAME']).strip().lower()
-                    code = str(row['ISO_CODE']).strip()
-                    self._iso_map[name] = code
+            mask = df_iso['NAME'].notna() & df_iso['ISO_CODE'].notna()
+            names = df_iso.loc[mask, 'NAME'].str.strip().str.lower()
+            codes = df_iso.loc[mask, 'ISO_CODE'].str.strip()
+            self._iso_map.update(zip(names.to_numpy(), codes.to_numpy()))
             
             # Add common variations
             self._add_country_variations()
@@ -145,11 +170,7 @@ class LandmarkCarrier(BaseCarrier):
         Returns:
             The next working day
         """
-        next_day = from_date + timedelta(days=1)
-        # Skip weekends: Saturday (5) and Sunday (6)
-        while next_day.weekday() >= 5:
-            next_day += timedelta(days=1)
-        return next_day
+        return from_date + timedelta(days=self._NEXT_WORKING_DAY_OFFSET[from_date.weekday()])
     
     def set_metadata(self, workbook, po_number: str, shipment_date: str) -> None:
         """Store PO number and calculate deposit date (next working day)."""
@@ -169,10 +190,7 @@ class LandmarkCarrier(BaseCarrier):
         """
         # Check ISO codes are loaded
         if not self._iso_codes_loaded:
-            return PlacementResult(
-                success=False,
-                error_message="ISO codes not loaded. Call load_iso_codes() first."
-            )
+            return _ISO_NOT_LOADED
         
         # Get ISO code
         iso_code = self.get_iso_code(record.country)
@@ -183,22 +201,28 @@ class LandmarkCarrier(BaseCarrier):
             )
         
         # Get service/product code
-        service = self.normalise_service(record.service)
-        product_code = self.SERVICE_TO_PRODUCT.get(service)
-        if not product_code:
-            return PlacementResult(
-                success=False,
-                error_message=f"Unknown service type: {record.service}"
-            )
+        product_code = self._product_codes.get(record.service)
+        if product_code is None:
+            service = self.normalise_service(record.service)
+            product_code = self.SERVICE_TO_PRODUCT.get(service)
+            if not product_code:
+                return PlacementResult(
+                    success=False,
+                    error_message=f"Unknown service type: {record.service}"
+                )
+            self._product_codes[record.service] = product_code
         
         # Get format code
-        format_type = self.normalise_format(record.format)
-        format_code = self.FORMAT_CODES.get(format_type)
-        if not format_code:
-            return PlacementResult(
-                success=False,
-                error_message=f"Unknown format type: {record.format}"
-            )
+        format_code = self._format_codes.get(record.format)
+        if format_code is None:
+            format_type = self.normalise_format(record.format)
+            format_code = self.FORMAT_CODES.get(format_type)
+            if not format_code:
+                return PlacementResult(
+                    success=False,
+                    error_message=f"Unknown format type: {record.format}"
+                )
+            self._format_codes[record.format] = format_code
         
         # Create order line
         order_line = LandmarkOrderLine(
@@ -209,12 +233,13 @@ class LandmarkCarrier(BaseCarrier):
             product_code=product_code,
         )
         
-        self._order_lines.append(order_line)
+        product_lines = self._lines_by_product[product_code]
+        product_lines.append(order_line)
         
         return PlacementResult(
             success=True,
             sheet_name="Upload",
-            row=len(self._order_lines) + 1,
+            row=len(product_lines) + 1,
             items_col=4,
             weight_col=3,
         )
@@ -226,74 +251,65 @@ class LandmarkCarrier(BaseCarrier):
         Generates separate files for Economy (12SL03) and Priority (12SL02).
         
         Args:
-            output_dir: Directory to save the CSV files
+            output_dir: Directory to save the CSV files (str or path-like)
             
         Returns:
             List of generated file paths
         """
         files_created = []
+        output_dir = os.fspath(output_dir)
+        suffix = f"_{self._file_date}_{self._po_number}.csv"
         
-        # Group by product code
-        economy_lines = [line for line in self._order_lines if line.product_code == '12SL03']
-        priority_lines = [line for line in self._order_lines if line.product_code == '12SL02']
-
-        # Write Economy file
-        if economy_lines:
-            filename = f"Landmark_Economy_{self._file_date}_{self._po_number}.csv"
-            filepath = os.path.join(output_dir, filename)
-            self._write_csv(filepath, '12SL03', economy_lines)
-            files_created.append(filepath)
-        
-        # Write Priority file
-        if priority_lines:
-            filename = f"Landmark_Priority_{self._file_date}_{self._po_number}.csv"
-            filepath = os.path.join(output_dir, filename)
-            self._write_csv(filepath, '12SL02', priority_lines)
-            files_created.append(filepath)
+        # One file per product code (Economy first, then Priority)
+        for product_code, lines in self._lines_by_product.items():
+            if lines:
+                service = self.PRODUCT_SERVICES[product_code]
+                filepath = os.path.join(output_dir, f"Landmark_{service}{suffix}")
+                self._write_csv(filepath, product_code, lines)
+                files_created.append(filepath)
         
         return files_created
     
     def _write_csv(self, filepath: str, product_code: str, lines: List[LandmarkOrderLine]) -> None:
         """Write a single CSV upload file."""
+        # Header row (pipe-separated)
+        header = f"{self.CONTRACT_NR}|{product_code}|{self._deposit_date}|{self.DEPOSIT_DAY_PART}||{self._po_number}|\n"
+        # Data rows (pipe-separated), built up front so the file takes a single write
+        body = ''.join([
+            f"{line.iso_code}|{line.format_code}|{line.weight_kg}|{line.pieces}\n"
+            for line in lines
+        ])
         with open(filepath, 'w', newline='') as f:
-            # Header row (pipe-separated)
-            f.write(f"{self.CONTRACT_NR}|{product_code}|{self._deposit_date}|{self.DEPOSIT_DAY_PART}||{self._po_number}|\n")
-            # Data rows (pipe-separated)
-            for line in lines:
-                f.write(f"{line.iso_code}|{line.format_code}|{line.weight_kg}|{line.pieces}\n")
+            f.write(header + body)
     
     def clear_order_lines(self) -> None:
         """Clear accumulated order lines for fresh processing."""
-        self._order_lines = []
+        self._lines_by_product = {code: [] for code in self.PRODUCT_SERVICES}
         self._po_number = ""
         self._deposit_date = ""
         self._file_date = ""
     
     def get_order_lines(self) -> List[LandmarkOrderLine]:
-        """Return accumulated order lines."""
-        return self._order_lines
+        """Return accumulated order lines, grouped by product code."""
+        return list(chain.from_iterable(self._lines_by_product.values()))
     
     def get_summary(self) -> Dict[str, dict]:
         """Get a summary of accumulated order lines by service type."""
-        economy_lines = [line for line in self._order_lines if line.product_code == '12SL03']
-        priority_lines = [line for line in self._order_lines if line.product_code == '12SL02']
-        
         summary = {}
         
-        if economy_lines:
-            summary['Economy'] = {
-                'product_code': '12SL03',
-                'rows': len(economy_lines),
-                'total_pieces': sum(line.pieces for line in economy_lines),
-                'total_weight_kg': round(sum(line.weight_kg for line in economy_lines), 3),
-            }
-
-        if priority_lines:
-            summary['Priority'] = {
-                'product_code': '12SL02',
-                'rows': len(priority_lines),
-                'total_pieces': sum(line.pieces for line in priority_lines),
-                'total_weight_kg': round(sum(line.weight_kg for line in priority_lines), 3),
-            }
+        for product_code, lines in self._lines_by_product.items():
+            if lines:
+                # One pass per product for both totals
+                total_pieces = 0
+                total_weight = 0.0
+                for line in lines:
+                    total_pieces += line.pieces
+                    total_weight += line.weight_kg
+                summary[self.PRODUCT_SERVICES[product_code]] = {
+                    'product_code': product_code,
+                    'rows': len(lines),
+                    'total_pieces': total_pieces,
+                    'total_weight_kg': round(total_weight, 3),
+                }
         
         return summary
@@ -7,8 +7,27 @@ Handles three distinct sheet structures:
 - Europe & ROW 2025: Format-based (Letters/Flats/Packets), no weight breaks
 """
 
+from bisect import bisect_left
+from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Tuple, List, Optional
-from .base import BaseCarrier, ShipmentRecord, PlacementResult
+from .base import BaseCarrier, ShipmentRecord, PlacementResult, fold_country
+
+
+# Column B labels that are not countries on the weight-break sheets
+_SKIP_ROWS = frozenset(('TOTALS:', 'Indicia Service ', 'GRAND TOTAL:'))
+
+# Region headings on the Europe & ROW sheet
+_REGION_HEADERS = frozenset((
+    'AFRICA', 'AMERICAS', 'ASIA', 'EUROPE',
+    'FAR EAST & AUSTRALASIA', 'MIDDLE EAST', 'OCEANIA',
+))
+
+# Labels that end the current country block on the Europe & ROW sheet
+_EUROPE_ROW_BREAKS = _REGION_HEADERS | {'TOTALS:', 'GRAND TOTAL:'}
+
+_LOWER = itemgetter('lower')
+_UPPER = itemgetter('upper')
 
 
 class MailAmericasCarrier(BaseCarrier):
@@ -17,18 +36,18 @@ class MailAmericasCarrier(BaseCarrier):
     carrier_name = "Mail Americas"
     template_filename = "Mail_America_Africa_2025.xlsx"
     
-    # Service columns for Africa/Americas sheets (weight-break based)
+    # Service (items, kg) columns for Africa/Americas sheets (weight-break based)
     # Standard = Untracked Economy Mail, Priority = Untracked Priority Mail
     SERVICE_COLUMNS = {
-        'Economy': {'items': 5, 'kg': 6},    # E, F
-        'Priority': {'items': 7, 'kg': 8},   # G, H
+        'Economy': (5, 6),    # E, F
+        'Priority': (7, 8),   # G, H
     }
     
-    # Format columns for Europe & ROW sheet
+    # Format (items, kg) columns for Europe & ROW sheet
     FORMAT_COLUMNS = {
-        'Letters': {'items': 4, 'kg': 5},   # D, E
-        'Flats': {'items': 6, 'kg': 7},     # F, G
-        'Packets': {'items': 8, 'kg': 9},   # H, I
+        'Letters': (4, 5),   # D, E
+        'Flats': (6, 7),     # F, G
+        'Packets': (8, 9),   # H, I
     }
     
     def __init__(self):
@@ -54,11 +73,23 @@ class MailAmericasCarrier(BaseCarrier):
             'Central African Republic': 'Central African Rep.',
         }
         
+        # Same mappings keyed by folded name, for map_country
+        self._folded_country_mapping = {
+            fold_country(k): v for k, v in self.country_mapping.items()
+        }
+        
         # Caches for country->sheet/row mappings
         self._africa_index: Dict[str, List[Dict]] = {}
         self._americas_index: Dict[str, List[Dict]] = {}
         self._europe_row_index: Dict[str, List[Dict]] = {}
+        # Accent/case/whitespace-insensitive fallback: folded name -> (sheet, breaks)
+        self._lower_index: Dict[str, Tuple[str, List[Dict]]] = {}
+        self._unified_cache: Optional[Dict[str, dict]] = None
         self._index_built = False
+        
+        # Raw sheet service/format values already resolved to their columns
+        self._service_columns: Dict[str, Tuple[int, int]] = {}
+        self._format_columns: Dict[str, Tuple[int, int]] = {}
     
     def _parse_weight_string(self, weight_str: str) -> Tuple[Optional[int], Optional[int]]:
         """Parse weight range string like '0 - 2000 grs' to (lower, upper)."""
@@ -86,14 +117,13 @@ class MailAmericasCarrier(BaseCarrier):
         # Build Mail Africa index
         ws = workbook['Mail Africa 2025']
         current_country = None
-        for row in range(9, 67):
-            country = ws.cell(row=row, column=2).value
-            lower = ws.cell(row=row, column=3).value
-            upper = ws.cell(row=row, column=4).value
-            
-            if country and str(country).strip() not in ['TOTALS:', 'Indicia Service ', 'GRAND TOTAL:']:
-                current_country = str(country).strip()
-                self._africa_index[current_country] = []
+        rows = ws.iter_rows(min_row=9, max_row=66, min_col=2, max_col=4, values_only=True)
+        for row, (country, lower, upper) in enumerate(rows, start=9):
+            if country:
+                country_str = str(country).strip()
+                if country_str not in _SKIP_ROWS:
+                    current_country = country_str
+                    self._africa_index[current_country] = []
             
             if current_country and lower is not None and upper is not None:
                 try:
@@ -108,14 +138,13 @@ class MailAmericasCarrier(BaseCarrier):
         # Build Mail Americas index
         ws = workbook['Mail Americas 2025']
         current_country = None
-        for row in range(9, 123):
-            country = ws.cell(row=row, column=2).value
-            lower = ws.cell(row=row, column=3).value
-            upper = ws.cell(row=row, column=4).value
-            
-            if country and str(country).strip() not in ['TOTALS:', 'Indicia Service ', 'GRAND TOTAL:']:
-                current_country = str(country).strip()
-                self._americas_index[current_country] = []
+        rows = ws.iter_rows(min_row=9, max_row=122, min_col=2, max_col=4, values_only=True)
+        for row, (country, lower, upper) in enumerate(rows, start=9):
+            if country:
+                country_str = str(country).strip()
+                if country_str not in _SKIP_ROWS:
+                    current_country = country_str
+                    self._americas_index[current_country] = []
             
             if current_country and lower is not None and upper is not None:
                 try:
@@ -129,17 +158,13 @@ class MailAmericasCarrier(BaseCarrier):
         
         # Build Europe & ROW index
         ws = workbook['Europe & ROW 2025']
-        region_headers = ['AFRICA', 'AMERICAS', 'ASIA', 'EUROPE', 
-                         'FAR EAST & AUSTRALASIA', 'MIDDLE EAST', 'OCEANIA']
         current_country = None
         
-        for row in range(9, 123):
-            country = ws.cell(row=row, column=2).value
-            weight_str = ws.cell(row=row, column=3).value
-            
+        rows = ws.iter_rows(min_row=9, max_row=122, min_col=2, max_col=3, values_only=True)
+        for row, (country, weight_str) in enumerate(rows, start=9):
             if country:
                 country_str = str(country).strip()
-                if country_str in region_headers or country_str in ['TOTALS:', 'GRAND TOTAL:']:
+                if country_str in _EUROPE_ROW_BREAKS:
                     current_country = None
                     continue
                 current_country = country_str
@@ -154,39 +179,57 @@ class MailAmericasCarrier(BaseCarrier):
                         'upper': upper
                     })
         
+        # Weight breaks are disjoint ranges; keep them ascending so
+        # _find_weight_break_row can binary search on the upper bounds
+        for idx in (self._africa_index, self._americas_index):
+            for breaks in idx.values():
+                breaks.sort(key=_LOWER)
+        
+        # First match wins, in the same sheet order _find_country_sheet uses
+        for idx, sheet_name in [(self._africa_index, 'Mail Africa 2025'),
+                                (self._americas_index, 'Mail Americas 2025'),
+                                (self._europe_row_index, 'Europe & ROW 2025')]:
+            for template_country, breaks in idx.items():
+                self._lower_index.setdefault(fold_country(template_country), (sheet_name, breaks))
+        
         self._index_built = True
         return self._get_unified_index()
     
     def _get_unified_index(self) -> Dict[str, dict]:
-        """Create unified index for base class compatibility."""
-        index = {}
-        
-        # Add Africa countries
-        for country, breaks in self._africa_index.items():
-            index[country] = {
-                'Priority': {'sheet': 'Mail Africa 2025', 'breaks': breaks, 'type': 'weight_break'},
-                'Economy': {'sheet': 'Mail Africa 2025', 'breaks': breaks, 'type': 'weight_break'}
-            }
+        """
+        Create unified index for base class compatibility.
         
-        # Add Americas countries
-        for country, breaks in self._americas_index.items():
-            index[country] = {
-                'Priority': {'sheet': 'Mail Americas 2025', 'breaks': breaks, 'type': 'weight_break'},
-                'Economy': {'sheet': 'Mail Americas 2025', 'breaks': breaks, 'type': 'weight_break'}
-            }
+        Built once per carrier instance. Priority and Economy share one
+        location dict per country since both resolve to the same rows.
+        """
+        if self._unified_cache is not None:
+            return self._unified_cache
         
-        # Add Europe & ROW countries (format-based, not service-based)
-        for country, breaks in self._europe_row_index.items():
-            index[country] = {
-                'Priority': {'sheet': 'Europe & ROW 2025', 'breaks': breaks, 'type': 'format_based'},
-                'Economy': {'sheet': 'Europe & ROW 2025', 'breaks': breaks, 'type': 'format_based'}
-            }
+        index = {}
+        for idx, sheet_name, index_type in [
+            (self._africa_index, 'Mail Africa 2025', 'weight_break'),
+            (self._americas_index, 'Mail Americas 2025', 'weight_break'),
+            # Europe & ROW is format-based, not service-based
+            (self._europe_row_index, 'Europe & ROW 2025', 'format_based'),
+        ]:
+            for country, breaks in idx.items():
+                location = {'sheet': sheet_name, 'breaks': breaks, 'type': index_type}
+                index[country] = {'Priority': location, 'Economy': location}
         
+        self._unified_cache = index
         return index
     
+    def map_country(self, carrier_country: str) -> Optional[str]:
+        """Map IST country name to manifest name (accents, case and padding ignored)."""
+        if type(carrier_country) is not str:
+            return carrier_country
+        return self._folded_country_mapping.get(fold_country(carrier_country), carrier_country)
+    
     def _find_country_sheet(self, country: str) -> Tuple[Optional[str], Optional[List[Dict]]]:
         """Find which sheet a country belongs to."""
         mapped = self.map_country(country) or country
+        if type(mapped) is not str:
+            return None, None
         
         # Try exact match first
         if mapped in self._africa_index:
@@ -196,15 +239,8 @@ class MailAmericasCarrier(BaseCarrier):
         if mapped in self._europe_row_index:
             return 'Europe & ROW 2025', self._europe_row_index[mapped]
         
-        # Try case-insensitive and whitespace-normalized match
-        for idx, sheet_name in [(self._africa_index, 'Mail Africa 2025'),
-                                (self._americas_index, 'Mail Americas 2025'),
-                                (self._europe_row_index, 'Europe & ROW 2025')]:
-            for template_country in idx.keys():
-                if template_country.strip().lower() == mapped.strip().lower():
-                    return sheet_name, idx[template_country]
-        
-        return None, None
+        # Try accent/case-insensitive and whitespace-normalized match
+        return self._lower_index.get(fold_country(mapped), (None, None))
     
     def _find_weight_break_row(self, avg_weight_kg: float, breaks: List[Dict]) -> Optional[int]:
         """Find manifest row matching the average weight."""
@@ -213,14 +249,15 @@ class MailAmericasCarrier(BaseCarrier):
         
         avg_weight_g = avg_weight_kg * 1000
         
-        for wb in breaks:
-            if wb['lower'] <= avg_weight_g <= wb['upper']:
-                return wb['row']
+        # First break whose upper bound reaches the weight
+        i = bisect_left(breaks, avg_weight_g, key=_UPPER)
+        if i < len(breaks) and breaks[i]['lower'] <= avg_weight_g:
+            return breaks[i]['row']
         
         # Allow small tolerance for edge cases
-        for wb in breaks:
-            if wb['lower'] - 1 <= avg_weight_g <= wb['upper'] + 1:
-                return wb['row']
+        i = bisect_left(breaks, avg_weight_g - 1, key=_UPPER)
+        if i < len(breaks) and breaks[i]['lower'] - 1 <= avg_weight_g:
+            return breaks[i]['row']
         
         return None
     
@@ -229,8 +266,7 @@ class MailAmericasCarrier(BaseCarrier):
         if country_info['type'] == 'format_based':
             # Europe & ROW - use format columns
             fmt = format_type if format_type in self.FORMAT_COLUMNS else 'Flats'
-            cols = self.FORMAT_COLUMNS[fmt]
-            return cols['items'], cols['kg']
+            return self.FORMAT_COLUMNS[fmt]
         else:
             # This shouldn't be called for weight-break sheets
             # as we handle them differently in place_record
@@ -238,8 +274,6 @@ class MailAmericasCarrier(BaseCarrier):
     
     def set_metadata(self, workbook, po_number: str, shipment_date: str) -> None:
         """Set PO and date on all three sheets."""
-        from datetime import datetime
-        
         # Format date as DD/MM/YYYY
         if isinstance(shipment_date, str) and shipment_date:
             try:
@@ -269,6 +303,8 @@ class MailAmericasCarrier(BaseCarrier):
         Overrides base class to handle:
         - Weight-break matching for Africa/Americas
         - Format-based placement for Europe & ROW
+        
+        Totals are accumulated and written by flush_to_workbook().
         """
         # Find country's sheet and weight breaks
         sheet_name, breaks = self._find_country_sheet(record.country)
@@ -279,10 +315,6 @@ class MailAmericasCarrier(BaseCarrier):
                 error_message=f"Country not found in manifest: {record.country}"
             )
         
-        ws = workbook[sheet_name]
-        service = self.normalise_service(record.service)
-        format_type = self.normalise_format(record.format)
-        
         if sheet_name == 'Europe & ROW 2025':
             # Format-based placement - use first row for country
             if not breaks:
@@ -292,14 +324,19 @@ class MailAmericasCarrier(BaseCarrier):
                 )
             
             target_row = breaks[0]['row']
-            cols = self.FORMAT_COLUMNS.get(format_type, self.FORMAT_COLUMNS['Flats'])
-            
-            self._add_to_cell(ws, target_row, cols['items'], record.items)
-            self._add_to_cell(ws, target_row, cols['kg'], record.weight)
-            
+            cols = self._format_columns.get(record.format)
+            if cols is None:
+                format_type = self.normalise_format(record.format)
+                cols = self.FORMAT_COLUMNS.get(format_type, self.FORMAT_COLUMNS['Flats'])
+                self._format_columns[record.format] = cols
+        
         else:
             # Weight-break based placement (Africa/Americas)
-            cols = self.SERVICE_COLUMNS.get(service, self.SERVICE_COLUMNS['Economy'])
+            cols = self._service_columns.get(record.service)
+            if cols is None:
+                service = self.normalise_service(record.service)
+                cols = self.SERVICE_COLUMNS.get(service, self.SERVICE_COLUMNS['Economy'])
+                self._service_columns[record.service] = cols
             
             # Calculate average weight per item for weight break matching
             if record.items > 0:
@@ -314,25 +351,14 @@ class MailAmericasCarrier(BaseCarrier):
                     success=False,
                     error_message=f"No matching weight break for {record.country} (avg: {avg_weight_kg:.3f}kg)"
                 )
-            
-            self._add_to_cell(ws, target_row, cols['items'], record.items)
-            self._add_to_cell(ws, target_row, cols['kg'], record.weight)
+        
+        items_col, weight_col = cols
+        self._accumulate(sheet_name, target_row, items_col, weight_col, record.items, record.weight)
         
         return PlacementResult(
             success=True,
             sheet_name=sheet_name,
             row=target_row,
-            items_col=cols['items'],
-            weight_col=cols['kg']
+            items_col=items_col,
+            weight_col=weight_col
         )
-    
-    def _add_to_cell(self, ws, row: int, col: int, value: float) -> None:
-        """Add value to existing cell value."""
-        current = ws.cell(row=row, column=col).value
-        if current is None or current == '':
-            current = 0
-        try:
-            current = float(current)
-        except (ValueError, TypeError):
-            current = 0
-        ws.cell(row=row, column=col).value = current + value
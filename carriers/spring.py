@@ -7,11 +7,34 @@ country/format combination is a separate row, rather than a matrix layout.
 
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
 from openpyxl import load_workbook
 from .base import BaseCarrier, ShipmentRecord, PlacementResult
 
 
-@dataclass
+# Destination codes that take the EU format codes (B/L/N).
+# EUR (Rest of Europe non EU) is excluded - it uses ROW format codes.
+_EU_DEST_CODES = frozenset({
+    'AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DK', 'EE', 'FI', 'FR',
+    'DE', 'GR', 'HU', 'IS', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT',
+    'NL', 'NO', 'PL', 'PT', 'RO', 'RS', 'SK', 'SI', 'ES', 'SE',
+    'CH',
+})
+
+# Column A-J and M-R values of an order line, fetched in one call each
+_ORDER_FIELDS = attrgetter(
+    'customer_number', 'customer_ref_1', 'customer_ref_2', 'quote_ref',
+    'count_sort', 'pre_franked', 'product_code', 'nr_satchels', 'nr_bags',
+    'nr_boxes',
+)
+_LINE_FIELDS = attrgetter(
+    'destination_code', 'format_code', 'weightbreak_from', 'weightbreak_to',
+    'nr_items', 'weight_kg',
+)
+
+
+@dataclass(slots=True, frozen=True)
 class SpringOrderLine:
     """A single order line for Spring manifest."""
     customer_number: str
@@ -270,33 +293,26 @@ class SpringCarrier(BaseCarrier):
         'Maldives': 'ROW',
     }
     
+    # Single lookup table: direct mappings take precedence over fallbacks
+    DESTINATION_CODES = {**REGIONAL_FALLBACKS, **COUNTRY_TO_CODE}
+    
     def __init__(self):
         super().__init__()
         self._order_lines: List[SpringOrderLine] = []
         self._po_number = ""
+        # (country, format) -> (destination_code, format_code); static data only
+        self._resolve_cache: Dict[Tuple[str, str], Tuple[str, str]] = {}
     
     def get_destination_code(self, country: str) -> Optional[str]:
-        """Get Spring destination code for a country."""
-        # Try direct mapping first
-        if country in self.COUNTRY_TO_CODE:
-            return self.COUNTRY_TO_CODE[country]
-        
-        # Try regional fallback
-        if country in self.REGIONAL_FALLBACKS:
-            return self.REGIONAL_FALLBACKS[country]
-        
-        return None
+        """Get Spring destination code for a country (direct or regional fallback)."""
+        return self.DESTINATION_CODES.get(country)
     
     def is_eu_destination(self, destination_code: str) -> bool:
         """Check if destination code is EU (uses B/L/N format codes).
         
         Note: EUR (Rest of Europe non EU) uses ROW format codes (P/G/E), not EU codes.
         """
-        eu_codes = {'AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DK', 'EE', 'FI', 'FR',
-                    'DE', 'GR', 'HU', 'IS', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT',
-                    'NL', 'NO', 'PL', 'PT', 'RO', 'RS', 'SK', 'SI', 'ES', 'SE',
-                    'CH'}  # EUR excluded - uses ROW format codes
-        return destination_code in eu_codes
+        return destination_code in _EU_DEST_CODES
     
     def get_format_code(self, format_type: str, destination_code: str) -> str:
         """Get Spring format code based on format type and destination."""
@@ -324,13 +340,20 @@ class SpringCarrier(BaseCarrier):
         Convert a shipment record to a Spring order line.
         Instead of placing in cells, we accumulate order lines.
         """
-        # Get destination code
-        dest_code = self.get_destination_code(record.country)
-        if not dest_code:
-            return PlacementResult(
-                success=False,
-                error_message=f"No destination code mapping for: {record.country}"
-            )
+        # Get destination and format codes (memoised per country/format pair)
+        key = (record.country, record.format)
+        resolved = self._resolve_cache.get(key)
+        if resolved is None:
+            dest_code = self.get_destination_code(record.country)
+            if not dest_code:
+                return PlacementResult(
+                    success=False,
+                    error_message=f"No destination code mapping for: {record.country}"
+                )
+            format_type = self.normalise_format(record.format)
+            resolved = (dest_code, self.get_format_code(format_type, dest_code))
+            self._resolve_cache[key] = resolved
+        dest_code, format_code = resolved
         
         # Get service/product code
         service = self.normalise_service(record.service)
@@ -341,10 +364,6 @@ class SpringCarrier(BaseCarrier):
                 error_message=f"Unknown service type: {record.service}"
             )
         
-        # Get format code
-        format_type = self.normalise_format(record.format)
-        format_code = self.get_format_code(format_type, dest_code)
-        
         # Create order line
         order_line = SpringOrderLine(
             customer_number=self.CUSTOMER_NUMBER,
@@ -377,81 +396,70 @@ class SpringCarrier(BaseCarrier):
             weight_col=18,
         )
     
-    def write_manifest(self, template_path: str, output_path: str) -> None:
+    def _write_block(self, ws, lines: List[SpringOrderLine], row_idx: int) -> int:
         """
-        Write accumulated order lines to the Spring manifest template.
-        """
-        wb = load_workbook(template_path)
-        ws = wb['Orders']
-        
-        # Clear existing data rows (keep header row 1)
-        for row in range(2, ws.max_row + 1):
-            for col in range(1, 19):
-                ws.cell(row=row, column=col).value = None
+        Write one product code's order lines to the Orders sheet from row_idx.
         
-        # Group order lines by product code (1MI first, then 2MI)
-        priority_lines = [line for line in self._order_lines if line.product_code == '1MI']
-        economy_lines = [line for line in self._order_lines if line.product_code == '2MI']
-        
-        row_idx = 2  # Start writing from row 2 (row 1 is headers)
+        Values go into the template's existing cells so their formatting is
+        kept. Returns the next free row.
+        """
+        if not lines:
+            return row_idx
         
-        # Write 1MI (Priority) order block
-        for i, line in enumerate(priority_lines):
-            # Order-level columns (A-L) only on first row of this product code block
-            if i == 0:
-                ws.cell(row=row_idx, column=1).value = line.customer_number
-                ws.cell(row=row_idx, column=2).value = line.customer_ref_1
-                ws.cell(row=row_idx, column=3).value = line.customer_ref_2
-                ws.cell(row=row_idx, column=4).value = line.quote_ref
-                ws.cell(row=row_idx, column=5).value = line.count_sort
-                ws.cell(row=row_idx, column=6).value = line.pre_franked
-                ws.cell(row=row_idx, column=7).value = line.product_code
-                ws.cell(row=row_idx, column=8).value = line.nr_satchels
-                ws.cell(row=row_idx, column=9).value = line.nr_bags
-                ws.cell(row=row_idx, column=10).value = line.nr_boxes
-                ws.cell(row=row_idx, column=11).value = 1  # Nr pallets - static
-                ws.cell(row=row_idx, column=12).value = line.nr_trays
-            
-            # Order line columns (M-R) on every row
-            ws.cell(row=row_idx, column=13).value = line.destination_code
-            ws.cell(row=row_idx, column=14).value = line.format_code
-            ws.cell(row=row_idx, column=15).value = line.weightbreak_from
-            ws.cell(row=row_idx, column=16).value = line.weightbreak_to
-            ws.cell(row=row_idx, column=17).value = line.nr_items
-            ws.cell(row=row_idx, column=18).value = line.weight_kg
-            row_idx += 1
+        # Order-level columns (A-L) only on first row of this product code block
+        first = lines[0]
+        values = (
+            _ORDER_FIELDS(first)
+            + (1, first.nr_trays)  # Nr pallets - static
+            + _LINE_FIELDS(first)
+        )
+        cell = ws.cell
+        for col, value in enumerate(values, 1):
+            cell(row=row_idx, column=col).value = value
+        row_idx += 1
         
-        # Write 2MI (Economy) order block
-        for i, line in enumerate(economy_lines):
-            # Order-level columns (A-L) only on first row of this product code block
-            if i == 0:
-                ws.cell(row=row_idx, column=1).value = line.customer_number
-                ws.cell(row=row_idx, column=2).value = line.customer_ref_1
-                ws.cell(row=row_idx, column=3).value = line.customer_ref_2
-                ws.cell(row=row_idx, column=4).value = line.quote_ref
-                ws.cell(row=row_idx, column=5).value = line.count_sort
-                ws.cell(row=row_idx, column=6).value = line.pre_franked
-                ws.cell(row=row_idx, column=7).value = line.product_code
-                ws.cell(row=row_idx, column=8).value = line.nr_satchels
-                ws.cell(row=row_idx, column=9).value = line.nr_bags
-                ws.cell(row=row_idx, column=10).value = line.nr_boxes
-                ws.cell(row=row_idx, column=11).value = 1  # Nr pallets - static
-                ws.cell(row=row_idx, column=12).value = line.nr_trays
-            
-            # Order line columns (M-R) on every row
-            ws.cell(row=row_idx, column=13).value = line.destination_code
-            ws.cell(row=row_idx, column=14).value = line.format_code
-            ws.cell(row=row_idx, column=15).value = line.weightbreak_from
-            ws.cell(row=row_idx, column=16).value = line.weightbreak_to
-            ws.cell(row=row_idx, column=17).value = line.nr_items
-            ws.cell(row=row_idx, column=18).value = line.weight_kg
+        # Remaining rows carry only the order line columns (M-R)
+        for line in islice(lines, 1, None):
+            for col, value in enumerate(_LINE_FIELDS(line), 13):
+                cell(row=row_idx, column=col).value = value
             row_idx += 1
+        return row_idx
+    
+    def write_manifest(self, template_path: str, output_path: str) -> None:
+        """
+        Write accumulated order lines to the Spring manifest template.
+        """
+        wb = load_workbook(template_path, keep_links=False)
         
-        # Delete Instructions and Product Combinations sheets
+        # Delete Instructions and Product Combinations sheets up front so
+        # they are never touched again or serialised on save
         for sheet_name in ['Instructions', 'Product Combinations']:
             if sheet_name in wb.sheetnames:
                 del wb[sheet_name]
         
+        ws = wb['Orders']
+        
+        # Clear existing data values in A-R (keep header row 1 and the
+        # template's cell formatting)
+        for row in ws.iter_rows(min_row=2, max_col=18):
+            for cell in row:
+                cell.value = None
+        
+        # Group order lines by product code (1MI first, then 2MI) in one pass
+        priority_lines: List[SpringOrderLine] = []
+        economy_lines: List[SpringOrderLine] = []
+        add_priority = priority_lines.append
+        add_economy = economy_lines.append
+        for line in self._order_lines:
+            if line.product_code == '1MI':
+                add_priority(line)
+            elif line.product_code == '2MI':
+                add_economy(line)
+        
+        # Write the 1MI block then the 2MI block, from row 2 (row 1 is headers)
+        row_idx = self._write_block(ws, priority_lines, 2)
+        self._write_block(ws, economy_lines, row_idx)
+        
         wb.save(output_path)
         wb.close()
     
@@ -97,6 +97,25 @@ class ManifestEngine:
         # Currently returns single group - carrier determined at sheet level
         return {'default': df}
     
+    @staticmethod
+    def _iter_records(data: pd.DataFrame):
+        """
+        Yield a ShipmentRecord per row of carrier data.
+        
+        Reads the five columns directly rather than building a Series per
+        row with iterrows(), which dominates the loop on large sheets.
+        """
+        for country, service, fmt, items, weight in zip(
+                data['Country'], data['Service'], data['Format'],
+                data['Items'], data['Weight (KG)']):
+            yield ShipmentRecord(
+                country=str(country),
+                service=str(service),
+                format=str(fmt),
+                items=int(items),
+                weight=float(weight)
+            )
+    
     def process_carrier(self, carrier_name: str, data: pd.DataFrame, 
                        po_number: str, max_errors: int = 5) -> ProcessingResult:
         """
@@ -166,6 +185,7 @@ class ManifestEngine:
             return self._process_landmark_carrier(carrier, data, po_number, template_path, max_errors)
         
         # Standard carrier processing (Asendia, PostNord)
+        carrier.template_path = template_path
         wb = load_workbook(template_path)
         
         # Build country index
@@ -178,15 +198,7 @@ class ManifestEngine:
         self.log(f"Set PO: {po_number}, Date: {shipment_date}")
         
         # Process each record
-        for idx, row in data.iterrows():
-            record = ShipmentRecord(
-                country=str(row['Country']),
-                service=str(row['Service']),
-                format=str(row['Format']),
-                items=int(row['Items']),
-                weight=float(row['Weight (KG)'])
-            )
-            
+        for record in self._iter_records(data):
             result = carrier.place_record(wb, record, country_index)
             
             if result.success:
@@ -201,9 +213,9 @@ class ManifestEngine:
                     self.log(f"  ✗ Stopping: exceeded {max_errors} errors")
                     break
         
-        # Flush aggregated data for Metafora carriers
+        # Write totals accumulated during placement
+        carrier.flush_to_workbook(wb)
         if isinstance(carrier, MetaforaBaseCarrier):
-            carrier.flush_to_workbook(wb)
             self.log(f"Wrote {len(carrier._aggregated_data)} data rows to manifest")
 
         # Generate output filename
@@ -246,15 +258,7 @@ class ManifestEngine:
         self.log(f"Set PO: {po_number}")
         
         # Process each record into order lines
-        for idx, row in data.iterrows():
-            record = ShipmentRecord(
-                country=str(row['Country']),
-                service=str(row['Service']),
-                format=str(row['Format']),
-                items=int(row['Items']),
-                weight=float(row['Weight (KG)'])
-            )
-            
+        for record in self._iter_records(data):
             result = carrier.place_record(None, record, {})
             
             if result.success:
@@ -280,8 +284,8 @@ class ManifestEngine:
         
         # Write order lines to manifest
         order_lines = carrier.get_order_lines()
-        priority_count = len([line for line in order_lines if line.product_code == '1MI'])
-        economy_count = len([line for line in order_lines if line.product_code == '2MI'])
+        priority_count = sum(line.product_code == '1MI' for line in order_lines)
+        economy_count = sum(line.product_code == '2MI' for line in order_lines)
         self.log(f"Generated {len(order_lines)} order lines (Priority: {priority_count}, Economy: {economy_count})")
         carrier.write_manifest(template_path, output_path)
         self.log(f"Saved upload file: {output_filename}")
@@ -339,15 +343,7 @@ class ManifestEngine:
         self.log(f"Set PO: {po_number}, Date: {shipment_date}")
         
         # Process each record into order lines
-        for idx, row in data.iterrows():
-            record = ShipmentRecord(
-                country=str(row['Country']),
-                service=str(row['Service']),
-                format=str(row['Format']),
-                items=int(row['Items']),
-                weight=float(row['Weight (KG)'])
-            )
-            
+        for record in self._iter_records(data):
             result = carrier.place_record(None, record, {})
             
             if result.success:
@@ -0,0 +1,131 @@
+"""
+Tests for BaseCarrier's batched writes: place_record() accumulates totals
+and flush_to_workbook() writes them once into the manifest.
+
+Run from the repository root with: python -m pytest -q
+"""
+
+from openpyxl import Workbook
+
+from carriers.base import BaseCarrier, ShipmentRecord
+
+
+class _GridCarrier(BaseCarrier):
+    """Minimal carrier: one sheet, items/weight columns per format."""
+
+    carrier_name = "Test"
+
+    FORMAT_COLUMNS = {
+        'Letters': (2, 3),
+        'Flats': (4, 5),
+        'Packets': (6, 7),
+    }
+
+    def build_country_index(self, workbook):
+        return {
+            'France': {'Priority': {'sheet': 'Manifest', 'row': 2}},
+            'Germany': {'Priority': {'sheet': 'Manifest', 'row': 3},
+                        'Economy': {'sheet': 'Manifest', 'row': 4}},
+        }
+
+    def get_cell_positions(self, country_info, format_type):
+        return self.FORMAT_COLUMNS[format_type]
+
+    def set_metadata(self, workbook, po_number, shipment_date):
+        pass
+
+
+def _template():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Manifest'
+    # Pre-filled template totals for France Letters, plus a blank string
+    ws['B2'] = 4
+    ws['C2'] = 0.1
+    ws['D3'] = ''
+    return wb
+
+
+def _place(carrier, wb, records):
+    index = carrier.build_country_index(wb)
+    return [carrier.place_record(wb, ShipmentRecord(*r), index) for r in records]
+
+
+def test_nothing_written_before_flush():
+    wb = _template()
+    carrier = _GridCarrier()
+    results = _place(carrier, wb, [('France', 'Priority', 'Letters', 3, 0.2)])
+
+    assert results[0].success
+    ws = wb['Manifest']
+    assert ws['B2'].value == 4
+    assert ws['C2'].value == 0.1
+
+
+def test_flush_adds_to_template_values_and_sums_weights_exactly():
+    wb = _template()
+    carrier = _GridCarrier()
+    results = _place(carrier, wb, [
+        ('France', 'Priority', 'Letters', 3, 0.2),
+        ('France', 'Priority', 'Letter', 2, 0.3),
+        ('Germany', 'Priority', 'Flats', 1, 0.3333),
+        ('Germany', 'Economy', 'Packets', 5, 1.0004),
+    ])
+    assert all(r.success for r in results)
+
+    carrier.flush_to_workbook(wb)
+    ws = wb['Manifest']
+
+    # Template values are added to; 0.1 + 0.2 + 0.3 is 0.6000000000000001 in floats
+    assert ws['B2'].value == 9
+    assert ws['C2'].value == 0.6
+    # Blank template cells count as zero
+    assert ws['D3'].value == 1
+    assert ws['E3'].value == 0.333
+    # Weights are totalled to the gram, items stay ints
+    assert ws['F4'].value == 5
+    assert type(ws['F4'].value) is int
+    assert ws['G4'].value == 1.0
+
+
+def test_flush_writes_pending_totals_once():
+    wb = _template()
+    carrier = _GridCarrier()
+    _place(carrier, wb, [('France', 'Priority', 'Letters', 1, 0.05)])
+
+    carrier.flush_to_workbook(wb)
+    carrier.flush_to_workbook(wb)
+
+    ws = wb['Manifest']
+    assert ws['B2'].value == 5
+    assert ws['C2'].value == 0.15
+
+
+def test_pending_weights_are_whole_grams():
+    wb = _template()
+    carrier = _GridCarrier()
+    # 1000 x 0.001 kg drifts away from 1.0 when summed as floats
+    _place(carrier, wb, [('France', 'Priority', 'Letters', 1, 0.001)] * 1000)
+
+    assert list(carrier._pending.values()) == [[1000, 1000]]
+    assert all(type(v) is int for v in carrier._pending[('Manifest', 2, 2, 3)])
+
+    carrier.flush_to_workbook(wb)
+    ws = wb['Manifest']
+    assert ws['B2'].value == 1004
+    assert ws['C2'].value == 1.1
+
+
+def test_failed_placement_is_not_accumulated():
+    wb = _template()
+    carrier = _GridCarrier()
+    results = _place(carrier, wb, [
+        ('Atlantis', 'Priority', 'Letters', 1, 0.01),
+        ('France', 'Economy', 'Letters', 1, 0.01),
+    ])
+
+    assert not any(r.success for r in results)
+    carrier.flush_to_workbook(wb)
+    ws = wb['Manifest']
+    assert ws['B2'].value == 4
+    assert ws['C2'].value == 0.1
@@ -0,0 +1,67 @@
+"""
+Tests for get_carrier(): resolving carrier sheet names to handlers.
+
+Run from the repository root with: python -m pytest -q
+"""
+
+import pytest
+
+from carriers import (
+    CARRIER_REGISTRY, get_carrier,
+    AsendiaCarrier, Asendia2025Carrier, PostNordCarrier, SpringCarrier,
+    AirBusinessCarrier, MailAmericasCarrier, LandmarkCarrier, DeutschePostCarrier,
+    UnitedBusinessCarrier, UnitedBusinessNZPCarrier, UnitedBusinessSPLCarrier,
+    MetaforaNZPCarrier, MetaforaSPLCarrier, RoyalMailCarrier,
+)
+
+
+@pytest.mark.parametrize('name', list(CARRIER_REGISTRY))
+def test_registry_names_resolve_exactly(name):
+    assert type(get_carrier(name)) is CARRIER_REGISTRY[name]
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Asendia UK Business Mail 2025', Asendia2025Carrier),
+    ('ASENDIA', AsendiaCarrier),
+    ('Asendia 2027', AsendiaCarrier),
+    ('PostNord 2026', PostNordCarrier),
+    ('Spring GDS', SpringCarrier),
+    ('AirBusiness', AirBusinessCarrier),
+    ('Air Business Ltd', AirBusinessCarrier),
+    ('Mail Americas Non Ready', MailAmericasCarrier),
+    ('Mail Africa', MailAmericasCarrier),
+    ('Landmark', LandmarkCarrier),
+    ('Deutsche Post', DeutschePostCarrier),
+    ('DPI', DeutschePostCarrier),
+    ('UKMail', DeutschePostCarrier),
+    ('United Business', UnitedBusinessCarrier),
+    ('UBL SPL ETOE', UnitedBusinessSPLCarrier),
+    ('United Business NZP', UnitedBusinessNZPCarrier),
+    ('United Business ETOE', UnitedBusinessNZPCarrier),
+    ('UBL T&D', UnitedBusinessNZPCarrier),
+    ('Royal Mail International', RoyalMailCarrier),
+    ('Metafora NZP', MetaforaNZPCarrier),
+    ('Metafora - SPL', MetaforaSPLCarrier),
+    # Earlier rules win when a name carries several carrier tokens
+    ('Spring via Royal Mail', SpringCarrier),
+])
+def test_names_dispatch_to_carrier(name, expected):
+    assert type(get_carrier(name)) is expected
+
+
+def test_get_carrier_returns_fresh_handlers():
+    assert get_carrier('PostNord 2026') is not get_carrier('PostNord 2026')
+
+
+@pytest.mark.parametrize('name, message', [
+    ('Jersey Post', 'Jersey Post is not a supported carrier'),
+    # 'publications' also contains the United Business token 'ubl'
+    ('Asendia Publications', 'Asendia Publications is not a supported carrier'),
+    ('PostNord MMP Parcel', 'PostNord MMP Parcel is not a supported carrier'),
+    ('Asendia Lettershop', 'Lettershop is not a supported carrier'),
+    ('Metafora', 'Metafora variant (NZP/SPL) not specified'),
+    ('Parcelforce', 'Unknown carrier: Parcelforce'),
+])
+def test_unsupported_names_raise(name, message):
+    with pytest.raises(ValueError, match=message.replace('(', r'\(').replace(')', r'\)')):
+        get_carrier(name)